@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+황금 키워드 발굴기 - 벤치마크
+모의 제공자로 파이프라인 단계별 실행 시간/처리량/최대 RSS 측정
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import main
+
+DEFAULT_COUNTS = [100, 10000, 100000]
+DEFAULT_ARCHIVE_FILES = 5000
+DEFAULT_INDEX_ARCHIVES = 1000
+DEFAULT_STARTUP_BUDGET_MS = 150
+LAZY_MODULES = ('requests', 'urllib3', 'multiprocessing', 'numpy')  # import main 시 로드되면 안 되는 모듈
+
+
+def mock_search_volume(keyword):
+    """키워드 해시 기반 결정적 검색량"""
+    return 10000 + zlib.crc32(keyword.encode('utf-8')) % 490000
+
+
+def mock_blog_count(keyword):
+    """키워드 해시 기반 결정적 블로그 수"""
+    return 5000 + zlib.crc32(keyword.encode('utf-8'), 1) % 95000
+
+
+def install_mock_providers():
+    """네트워크/랜덤 제공자를 모의 제공자로 교체"""
+    main.PROVIDERS['search_volume'] = (mock_search_volume, None)
+    main.PROVIDERS['blog_count'] = (mock_blog_count, None)
+    main.PROVIDERS['related_keywords'] = (lambda keyword: [], None)
+
+
+def use_output_dir(root):
+    """출력 경로를 임시 디렉토리로 변경"""
+    main.OUTPUT_DIR = Path(root)
+    main.ARCHIVE_DIR = main.OUTPUT_DIR / 'archives'
+    main.ARCHIVE_INDEX_DIR = main.OUTPUT_DIR / 'archive_index'
+    main.ARCHIVE_DATA_DIR = main.OUTPUT_DIR / 'archive_data'
+    main.KEYWORD_INDEX_DIR = main.OUTPUT_DIR / 'keyword_index'
+    main.ROW_CHUNK_DIR = main.OUTPUT_DIR / 'data_chunks'
+    main.ensure_directories()
+
+
+def make_candidates(count):
+    """합성 후보 키워드 생성"""
+    return [{'keyword': f'벤치마크 키워드 {i}', 'source': 'NAVER' if i % 2 else 'COUPANG'}
+            for i in range(count)]
+
+
+def make_archive_dir(archive_dir, count):
+    """합성 아카이브 파일 생성 (12시간 간격)"""
+    started = datetime(2020, 1, 1, 8)
+    for i in range(count):
+        name = (started + timedelta(hours=12 * i)).strftime("%Y-%m-%d_%Hh.html")
+        (archive_dir / name).write_text('<html></html>', encoding='utf-8')
+    return (started + timedelta(hours=12 * count)).strftime("%Y-%m-%d_%Hh.html")
+
+
+def reset_peak_rss():
+    """최대 RSS 기록 초기화 (Linux /proc/self/clear_refs, 지원하면 True)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _proc_status_mb(field):
+    """/proc/self/status의 메모리 항목 (MB, 없으면 None)"""
+    try:
+        status = Path('/proc/self/status').read_text()
+    except OSError:
+        return None
+    for line in status.splitlines():
+        if line.startswith(field + ':'):
+            return int(line.split()[1]) / 1024
+    return None
+
+
+def peak_rss_mb():
+    """프로세스 최대 RSS (MB, Linux는 마지막 초기화 이후의 VmHWM)"""
+    peak = _proc_status_mb('VmHWM')
+    if peak is not None:
+        return peak
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS는 바이트, Linux는 KB 단위
+    return peak / (1024 * 1024) if platform.system() == 'Darwin' else peak / 1024
+
+
+def run_stage(report, stage, count, func):
+    """단계 실행 후 측정값 기록 (최대 메모리는 해당 단계 동안의 값)
+
+    최대 RSS를 초기화할 수 없는 플랫폼은 프로세스 전체 최대치가 되므로 단계별 tracemalloc 최대치로 대체"""
+    per_stage_rss = reset_peak_rss()
+    start_rss = _proc_status_mb('VmRSS') if per_stage_rss else None
+    if not per_stage_rss:
+        tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    if per_stage_rss:
+        metric, peak = 'peak_rss_mb', peak_rss_mb()
+        growth = peak - start_rss
+    else:
+        _, traced = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        metric, peak = 'peak_traced_mb', traced / 1024 / 1024
+        growth = peak
+    row = {
+        'stage': stage,
+        'items': count,
+        'wall_time_s': round(elapsed, 4),
+        'throughput_per_s': round(count / elapsed, 1) if elapsed > 0 else None,
+        metric: round(peak, 1),
+        'stage_growth_mb': round(growth, 1),  # 단계 시작 시점 대비 증가분 (이전 단계가 남긴 메모리 제외)
+    }
+    report['stages'].append(row)
+    print(f"{stage:<32} {count:>9,} {row['wall_time_s']:>10.3f}s "
+          f"{row['throughput_per_s'] or 0:>12,.0f}/s {row[metric]:>9.1f}MB {row['stage_growth_mb']:>+9.1f}MB")
+    return result
+
+
+def bench_pipeline(counts, archive_files, workers):
+    """수집 이후 파이프라인 단계별 벤치마크"""
+    install_mock_providers()
+    report = {
+        'generated_at': datetime.now(main.KST).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'workers': workers,
+        'stages': [],
+    }
+
+    print(f"{'단계':<32} {'항목 수':>9} {'시간':>11} {'처리량':>14} {'최대 RSS':>11} {'단계 증가':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        use_output_dir(tmp)
+        no_limits = {name: 0 for name in main.PROVIDER_RATE_LIMITS}
+
+        for count in counts:
+            candidates = make_candidates(count)
+            results = run_stage(report, 'analyze_keywords', count,
+                                lambda: main.analyze_keywords(candidates, workers=workers,
+                                                              rate_limits=no_limits))
+            run_stage(report, 'create_archive_html', count,
+                      lambda: main.create_archive_html(results, main.ARCHIVE_DIR / 'bench.html'))
+            run_stage(report, 'save_data_json', count,
+                      lambda: main.save_data_json(results))
+            (main.ARCHIVE_DIR / 'bench.html').unlink()
+
+        # 아카이브 목록: 최초 색인 생성(전체 스캔)과 증분 갱신 비교
+        next_name = make_archive_dir(main.ARCHIVE_DIR, archive_files)
+        run_stage(report, 'update_archive_list (bootstrap)', archive_files,
+                  lambda: main.update_archive_list())
+        (main.ARCHIVE_DIR / next_name).write_text('<html></html>', encoding='utf-8')
+        run_stage(report, 'update_archive_list (incremental)', 1,
+                  lambda: main.update_archive_list(main.archive_entry(next_name)))
+
+    return report
+
+
+def make_results(count, seed=42):
+    """점수까지 계산된 합성 키워드 결과 생성"""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        source = rng.choice(('NAVER', 'COUPANG'))
+        records.append({
+            'keyword': f'벤치마크 키워드 {i}',
+            'source': source,
+            'sources': [source],
+            'search_volume': rng.randint(10000, 500000),
+            'blog_count': rng.randint(5000, 100000),
+            'related_keywords': [],
+            'estimated': []
+        })
+    return main.rank_results(main.score_records(records))
+
+
+def measure(func):
+    """함수 실행 시간(초)과 tracemalloc 최대 메모리(바이트) 측정"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def bench_archive_render(counts):
+    """스트리밍 기록 vs 전체 문자열 버퍼링 비교"""
+    now_str = datetime.now(main.KST).strftime("%Y년 %m월 %d일 %H시")
+    date_only = datetime.now(main.KST).strftime("%Y년 %m월 %d일")
+
+    print(f"{'키워드 수':>10} | {'스트리밍(s)':>11} | {'스트리밍 최대(KB)':>16} | {'버퍼링(s)':>9} | {'버퍼링 최대(KB)':>15}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'bench.html'
+        for count in counts:
+            data = make_results(count)
+
+            def streaming():
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.writelines(main.iter_archive_html(data, now_str, date_only))
+
+            def buffered():
+                html_content = ''.join(main.iter_archive_html(data, now_str, date_only))
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(html_content)
+
+            s_time, s_peak = measure(streaming)
+            b_time, b_peak = measure(buffered)
+            print(f"{count:>10,} | {s_time:>11.3f} | {s_peak / 1024:>16,.0f} | {b_time:>9.3f} | {b_peak / 1024:>15,.0f}")
+
+
+def bench_ranking(counts, k):
+    """전체 정렬 vs 힙 기반 상위 k개 선택/등급별 집계 비교"""
+    print(f"{'키워드 수':>10} | {'전체 정렬(s)':>12} | {'상위 ' + str(k) + '개(s)':>12} | {'등급별 집계(s)':>13}")
+    for count in counts:
+        data = make_results(count)
+        random.Random(count).shuffle(data)
+        sort_time, _ = measure(lambda: main.rank_results(data))
+        top_time, _ = measure(lambda: main.rank_results(data, k))
+        summary_time, _ = measure(lambda: main.summarize_results(data))
+        print(f"{count:>10,} | {sort_time:>12.3f} | {top_time:>12.3f} | {summary_time:>13.3f}")
+
+
+def bench_keyword_index(archive_files, keywords_per_archive=50, lookups=1000):
+    """역색인 증분 갱신 시간과 조회 지연시간 (아카이브 수 증가에 따른 변화)"""
+    rng = random.Random(7)
+    vocabulary = [f'{chr(0xAC00 + i % 400)}벤치 키워드 {i}' for i in range(keywords_per_archive * 4)]
+    started = datetime(2020, 1, 1, 8)
+
+    print(f"{'아카이브 수':>10} | {'증분 갱신(ms)':>13} | {'조회 평균(µs)':>13} | {'조회 최대(µs)':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        use_output_dir(tmp)
+        checkpoints = {archive_files // 10, archive_files // 2, archive_files}
+        for i in range(1, archive_files + 1):
+            name = (started + timedelta(hours=12 * i)).strftime("%Y-%m-%d_%Hh.html")
+            records = [{'keyword': kw, 'source': 'NAVER', 'sources': ['NAVER'],
+                        'search_volume': rng.randint(10000, 500000), 'blog_count': rng.randint(5000, 100000),
+                        'related_keywords': [], 'estimated': []}
+                       for kw in rng.sample(vocabulary, keywords_per_archive)]
+            data = main.rank_results(main.score_records(records))
+            update_started = time.perf_counter()
+            main.update_keyword_index(name, data)
+            update_ms = (time.perf_counter() - update_started) * 1000
+            if i not in checkpoints:
+                continue
+
+            # 샤드를 한 번씩 읽어 둔 뒤(첫 조회) 반복 조회 지연시간 측정
+            for kw in vocabulary:
+                main.lookup_keyword(kw)
+            latencies = []
+            for kw in rng.choices(vocabulary, k=lookups):
+                lookup_started = time.perf_counter()
+                main.last_grade_reached(kw)
+                latencies.append((time.perf_counter() - lookup_started) * 1e6)
+            print(f"{i:>10,} | {update_ms:>13.1f} | {sum(latencies) / len(latencies):>13.1f} | {max(latencies):>13.1f}")
+
+
+def bench_shards(count, shard_counts, workers):
+    """샤드 모드 분석/채점 확장성 (모의 제공자, 속도 제한 없음) 및 샤드 수와 무관한 결과 확인"""
+    install_mock_providers()
+    candidates = make_candidates(count)
+    no_limits = {name: 0 for name in main.PROVIDER_RATE_LIMITS}
+    print(f"CPU 코어: {os.cpu_count()}개, 키워드 {count:,}개")
+    print(f"{'샤드 수':>8} | {'시간(s)':>9} | {'처리량(/s)':>12} | {'속도 향상':>9} | {'결과 동일':>9}")
+    baseline = reference = None
+    for shards in shard_counts:
+        started = time.perf_counter()
+        results = main.analyze_keywords_sharded(candidates, shards=shards, workers=workers, rate_limits=no_limits)
+        elapsed = time.perf_counter() - started
+        signature = [(item['keyword'], item['golden_score']) for item in results]
+        baseline = baseline or elapsed
+        reference = reference or signature
+        print(f"{shards:>8} | {elapsed:>9.2f} | {count / elapsed:>12,.0f} | {baseline / elapsed:>8.2f}x | "
+              f"{'예' if signature == reference else '아니오':>9}")
+
+
+def _run_python(args, cwd=None):
+    """새 인터프리터로 실행한 벽시계 시간(ms)과 stderr"""
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable] + args, cwd=cwd,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    return (time.perf_counter() - started) * 1000, completed.stderr
+
+
+def bench_startup(runs, budget_ms):
+    """콜드 스타트 측정: import main / --dry-run 실행 시간 (빈 인터프리터 대비), 예산 초과 또는 지연 로드 모듈이 로드되면 실패"""
+    script = str(Path(main.__file__).resolve())
+    root = str(Path(script).parent)
+    baseline = sorted(_run_python(['-c', 'pass'])[0] for _ in range(runs))[runs // 2]
+    import_ms = sorted(_run_python(['-c', 'import main'], cwd=root)[0] for _ in range(runs))[runs // 2] - baseline
+    with tempfile.TemporaryDirectory() as tmp:
+        dry_run_ms = sorted(_run_python([script, '--dry-run'], cwd=tmp)[0] for _ in range(runs))[runs // 2] - baseline
+
+    # -X importtime 출력: "import time: 자체(us) | 누적(us) | 모듈"
+    _, trace = _run_python(['-X', 'importtime', '-c', 'import main'], cwd=root)
+    modules = []
+    for line in trace.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            # 모듈 이름 앞 들여쓰기가 한 칸이면 최상위 import
+            modules.append((int(parts[1]), parts[2].strip(), not parts[2].startswith('  ')))
+    loaded = {name.split('.')[0] for _, name, _ in modules}
+    eager = [name for name in LAZY_MODULES if name in loaded]
+
+    print(f"빈 인터프리터: {baseline:.1f}ms (중앙값, {runs}회)")
+    print(f"import main: {import_ms:.1f}ms (예산 {budget_ms}ms)")
+    print(f"main.py --dry-run: {dry_run_ms:.1f}ms")
+    print("느린 최상위 import:")
+    for cumulative, name, _ in sorted((m for m in modules if m[2]), reverse=True)[:5]:
+        print(f"   - {name}: {cumulative / 1000:.1f}ms")
+
+    failures = []
+    if import_ms > budget_ms:
+        failures.append(f"import main {import_ms:.1f}ms > 예산 {budget_ms}ms")
+    if eager:
+        failures.append(f"지연 로드 대상이 import 시 로드됨: {', '.join(eager)}")
+    for failure in failures:
+        print(f"❌ {failure}")
+    return {'baseline_ms': baseline, 'import_ms': import_ms, 'dry_run_ms': dry_run_ms,
+            'budget_ms': budget_ms, 'eager_modules': eager, 'ok': not failures}
+
+
+def bench_record_memory(count):
+    """키워드 결과 dict 대비 KeywordRecord 메모리 비교"""
+    fetched_at = datetime.now(main.KST).isoformat(timespec='seconds')
+
+    def raw(i):
+        source = 'NAVER' if i % 2 else 'COUPANG'
+        return (f'벤치마크 키워드 {i}', source, 10000 + i % 490000, 5000 + i % 95000)
+
+    def build_dicts():
+        return [{
+            'keyword': keyword, 'source': source, 'sources': [source],
+            'search_volume': volume, 'blog_count': blogs,
+            'efficiency': round(blogs / volume, 2), 'golden_score': 90,
+            'grade': main.GRADE_LABELS[0], 'related_keywords': [], 'estimated': [],
+            'fetched_at': ''.join(fetched_at)
+        } for keyword, source, volume, blogs in map(raw, range(count))]
+
+    def build_records():
+        return [main.KeywordRecord(keyword, source, [source], volume, blogs,
+                                   round(blogs / volume, 2), 90, main.GRADE_LABELS[0],
+                                   [], [], ''.join(fetched_at))
+                for keyword, source, volume, blogs in map(raw, range(count))]
+
+    print(f"{'표현':<14} {'레코드 수':>10} {'최대 메모리(MB)':>16} {'레코드당(B)':>12}")
+    for name, build in (('dict', build_dicts), ('KeywordRecord', build_records)):
+        tracemalloc.start()
+        data = build()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del data
+        print(f"{name:<14} {count:>10,} {peak / 1024 / 1024:>16,.1f} {peak / count:>12,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='황금 키워드 발굴기 벤치마크')
+    parser.add_argument('mode', nargs='?', choices=['pipeline', 'render', 'records', 'ranking', 'index', 'startup', 'shards'],
+                        default='pipeline')
+    parser.add_argument('--counts', type=int, nargs='+', default=DEFAULT_COUNTS)
+    parser.add_argument('--archive-files', type=int, default=None,
+                        help=f'아카이브 수 (pipeline 기본 {DEFAULT_ARCHIVE_FILES}, index 기본 {DEFAULT_INDEX_ARCHIVES})')
+    parser.add_argument('--workers', type=int, default=main.ENRICH_WORKERS)
+    parser.add_argument('--records', type=int, default=1000000, help='records 모드 레코드 수')
+    parser.add_argument('--top-k', type=int, default=main.TOP_PAGE_SIZE, help='ranking 모드 상위 k')
+    parser.add_argument('--shards', type=int, nargs='+', default=None,
+                        help='shards 모드 샤드 수 목록 (기본: 1 2 4 CPU 코어 수, 키워드 수는 --records)')
+    parser.add_argument('--runs', type=int, default=5, help='startup 모드 반복 횟수 (중앙값 사용)')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_STARTUP_BUDGET_MS,
+                        help='startup 모드 import main 시간 예산 (초과 시 종료 코드 1)')
+    parser.add_argument('--output', default='bench_results.json', help='측정 결과 JSON 경로')
+    args = parser.parse_args()
+
+    if args.mode == 'render':
+        bench_archive_render(args.counts)
+    elif args.mode == 'index':
+        bench_keyword_index(args.archive_files or DEFAULT_INDEX_ARCHIVES)
+    elif args.mode == 'ranking':
+        bench_ranking(args.counts, args.top_k)
+    elif args.mode == 'records':
+        bench_record_memory(args.records)
+    elif args.mode == 'shards':
+        shard_counts = args.shards or sorted({1, 2, 4, os.cpu_count() or 1})
+        bench_shards(args.records, shard_counts, args.workers)
+    elif args.mode == 'startup':
+        if not bench_startup(args.runs, args.budget_ms)['ok']:
+            sys.exit(1)
+    else:
+        report = bench_pipeline(args.counts, args.archive_files or DEFAULT_ARCHIVE_FILES, args.workers)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ 벤치마크 결과 저장: {args.output}")
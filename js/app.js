@@ -3,6 +3,36 @@
 let currentKeywords = []; // 전역 데이터 저장
 let currentSort = { column: null, ascending: true };
 
+// 가상 스크롤 모드: 서버가 계산한 정렬 순열 + 고정 크기 행 묶음
+let tableIndex = null;
+const rowChunkCache = new Map();
+const sortOrderCache = new Map();  // '열:방향' → 정렬 순열 (처음 정렬할 때만 로드)
+const VIRTUAL_ROW_HEIGHT = 56;   // 행 높이 추정값 (px)
+const VIRTUAL_BLOCK_ROWS = 50;   // 한 번에 그리는 행 블록 크기
+let renderedWindow = null;
+let virtualScrollPending = false;
+
+// 내용 해시 매니페스트: 해시를 버전 쿼리로 붙여 바뀐 파일만 새로 받음
+// (시각만 바뀐 출력물은 다시 쓰지 않으므로 업데이트 시간도 매니페스트의 generated_at 사용)
+let contentManifest = null;
+
+function loadContentManifest() {
+    if (!contentManifest) {
+        contentManifest = fetch(CONFIG.api.contentManifest, { cache: 'no-cache' })
+            .then(response => response.ok ? response.json() : {})
+            .catch(() => ({}));
+    }
+    return contentManifest;
+}
+
+async function fetchOutput(path) {
+    const manifest = await loadContentManifest();
+    const key = path.startsWith(CONFIG.api.outputRoot) ? path.slice(CONFIG.api.outputRoot.length) : null;
+    const hash = key && (manifest.files || {})[key];
+    if (hash) return fetch(`${path}?v=${hash}`);
+    return fetch(path, { cache: 'no-cache' });
+}
+
 document.addEventListener('DOMContentLoaded', function() {
     loadData();
     loadArchiveList();
@@ -10,7 +40,23 @@ document.addEventListener('DOMContentLoaded', function() {
 
 async function loadData() {
     try {
-        const response = await fetch(CONFIG.api.data);
+        // 가상 스크롤 모드: 통계/정렬 순열만 먼저 받고 보이는 행 묶음만 로드
+        const indexResponse = await fetchOutput(CONFIG.api.dataIndex);
+        if (indexResponse.ok) {
+            tableIndex = await indexResponse.json();
+            renderDashboard(tableIndex);
+            AdsManager.initAllAds();
+            window.addEventListener('scroll', scheduleVirtualRender, { passive: true });
+            window.addEventListener('resize', scheduleVirtualRender);
+            return;
+        }
+    } catch (error) {
+        console.warn('정렬 순열 로드 실패, 전체 데이터로 대체:', error);
+        tableIndex = null;
+    }
+    
+    try {
+        const response = await fetchOutput(CONFIG.api.data);
         if (!response.ok) throw new Error('데이터를 불러올 수 없습니다');
         
         const data = await response.json();
@@ -28,10 +74,13 @@ async function loadData() {
 }
 
 function renderDashboard(data) {
-    // 업데이트 시간
+    // 업데이트 시간 (매니페스트가 마지막 실행 시각을 가짐)
     const updateTime = document.getElementById('update-time');
     if (updateTime && data.generated_at) {
         updateTime.textContent = formatDate(data.generated_at);
+        loadContentManifest().then(manifest => {
+            if (manifest.generated_at) updateTime.textContent = formatDate(manifest.generated_at);
+        });
     }
     
     // SEO 요약
@@ -47,22 +96,27 @@ function renderDashboard(data) {
     }
     
     // 통계 카드 업데이트
-    updateStatsCards(data.keywords);
+    updateStatsCards(data.keywords || [], data.stats);
     
     // 테이블 헤더에 정렬 기능 추가
     setupSortableHeaders();
     
     // 키워드 테이블 렌더링 (광고 포함)
-    renderKeywordTable(currentKeywords);
+    if (tableIndex) {
+        renderVirtualWindow();
+    } else {
+        renderKeywordTable(currentKeywords);
+    }
 }
 
-function updateStatsCards(keywords) {
+function updateStatsCards(keywords, stats) {
     if (!keywords) return;
     
-    const totalKeywords = keywords.length;
-    const diamondCount = keywords.filter(k => k.grade?.includes('DIAMOND')).length;
-    const blueOceanCount = keywords.filter(k => k.efficiency < 1.0).length;
-    const sourceCount = [...new Set(keywords.map(k => k.source))].length;
+    // 가상 스크롤 모드(data.index.json)에서는 서버에서 집계한 통계 사용
+    const totalKeywords = stats ? stats.total : keywords.length;
+    const diamondCount = stats ? stats.diamond : keywords.filter(k => k.grade?.includes('DIAMOND')).length;
+    const blueOceanCount = stats ? stats.blueocean : keywords.filter(k => k.efficiency < 1.0).length;
+    const sourceCount = stats ? stats.sources : [...new Set(keywords.map(k => k.source))].length;
     
     const statTotal = document.getElementById('stat-total');
     const statDiamond = document.getElementById('stat-diamond');
@@ -108,6 +162,19 @@ function sortTable(column, headerElement) {
         currentSort.ascending = false; // 기본 내림차순
     }
     
+    updateSortIcons(headerElement);
+    
+    // 가상 스크롤 모드: 미리 계산된 순열만 바꿔서 보이는 구간 다시 그리기
+    if (tableIndex) {
+        loadSortOrder(column, currentSort.ascending).catch(error => {
+            console.warn('정렬 순열 로드 실패:', error);
+        }).then(() => {
+            renderedWindow = null;
+            renderVirtualWindow();
+        });
+        return;
+    }
+    
     // 정렬 실행
     currentKeywords.sort((a, b) => {
         let valA = a[column] ?? 0;
@@ -120,17 +187,119 @@ function sortTable(column, headerElement) {
         }
     });
     
-    // 정렬 아이콘 업데이트
+    // 테이블 다시 렌더링
+    renderKeywordTable(currentKeywords);
+}
+
+// 정렬 아이콘 업데이트
+function updateSortIcons(headerElement) {
     document.querySelectorAll('.keyword-table thead th .sort-icon').forEach(icon => {
         icon.textContent = '↕';
     });
-    const sortIcon = headerElement.querySelector('.sort-icon');
+    const sortIcon = headerElement && headerElement.querySelector('.sort-icon');
     if (sortIcon) {
         sortIcon.textContent = currentSort.ascending ? '↑' : '↓';
     }
+}
+
+// ✅ 가상 스크롤: 표시 순서 p번째 행의 원본 위치 (방향별 순열, 동점은 원래 순서)
+function sortDirection(ascending) {
+    return ascending ? 'asc' : 'desc';
+}
+
+function rowPosition(p) {
+    const order = currentSort.column &&
+        sortOrderCache.get(`${currentSort.column}:${sortDirection(currentSort.ascending)}`);
+    return order ? order[p] : p;
+}
+
+function loadSortOrder(column, ascending) {
+    const direction = sortDirection(ascending);
+    const key = `${column}:${direction}`;
+    const file = tableIndex.orders && tableIndex.orders[column] && tableIndex.orders[column][direction];
+    if (!file || sortOrderCache.has(key)) return Promise.resolve();
+    return fetchOutput(CONFIG.api.outputRoot + tableIndex.chunk_path + file).then(response => {
+        if (!response.ok) throw new Error('정렬 순열을 불러올 수 없습니다');
+        return response.json();
+    }).then(order => {
+        sortOrderCache.set(key, order);
+    });
+}
+
+function loadRowChunk(number) {
+    if (!rowChunkCache.has(number)) {
+        const name = String(number).padStart(4, '0');
+        const url = CONFIG.api.outputRoot + tableIndex.chunk_path + name + '.json';
+        rowChunkCache.set(number, fetchOutput(url).then(response => {
+            if (!response.ok) throw new Error('행 묶음을 불러올 수 없습니다');
+            return response.json();
+        }).catch(error => {
+            rowChunkCache.delete(number);
+            throw error;
+        }));
+    }
+    return rowChunkCache.get(number);
+}
+
+function scheduleVirtualRender() {
+    if (virtualScrollPending) return;
+    virtualScrollPending = true;
+    requestAnimationFrame(() => {
+        virtualScrollPending = false;
+        renderVirtualWindow();
+    });
+}
+
+// ✅ 보이는 구간(앞뒤 한 블록 포함)만 렌더링, 나머지는 여백 행으로 높이 유지
+async function renderVirtualWindow() {
+    const tbody = document.getElementById('keyword-table-body');
+    if (!tbody || !tableIndex) return;
     
-    // 테이블 다시 렌더링
-    renderKeywordTable(currentKeywords);
+    const count = tableIndex.count;
+    const adInterval = CONFIG.ads.interval || 5;
+    const rowHeight = VIRTUAL_ROW_HEIGHT * (1 + 1 / adInterval);
+    const tableTop = tbody.getBoundingClientRect().top + window.scrollY;
+    const firstVisible = Math.floor(Math.max(0, window.scrollY - tableTop) / rowHeight);
+    const block = Math.floor(firstVisible / VIRTUAL_BLOCK_ROWS);
+    const start = Math.max(0, (block - 1) * VIRTUAL_BLOCK_ROWS);
+    const end = Math.min(count, (block + 2) * VIRTUAL_BLOCK_ROWS);
+    
+    const windowKey = `${currentSort.column}:${currentSort.ascending}:${start}`;
+    if (renderedWindow === windowKey) return;
+    renderedWindow = windowKey;
+    
+    const positions = [];
+    for (let p = start; p < end; p++) positions.push(rowPosition(p));
+    
+    const size = tableIndex.chunk_size;
+    const numbers = [...new Set(positions.map(position => Math.floor(position / size)))];
+    let chunks;
+    try {
+        chunks = new Map(await Promise.all(numbers.map(async n => [n, await loadRowChunk(n)])));
+    } catch (error) {
+        console.error('행 묶음 로드 실패:', error);
+        renderedWindow = null;
+        return;
+    }
+    // 로드하는 동안 스크롤/정렬이 바뀌었으면 새 구간이 그림
+    if (renderedWindow !== windowKey) return;
+    
+    let html = `<tr class="virtual-spacer" style="height:${Math.round(start * rowHeight)}px"></tr>`;
+    positions.forEach((position, i) => {
+        const p = start + i;
+        if (p > 0 && p % adInterval === 0) {
+            html += AdsManager.createTableAdRow(7);
+        }
+        html += createKeywordRow(chunks.get(Math.floor(position / size))[position % size]);
+    });
+    html += `<tr class="virtual-spacer" style="height:${Math.round((count - end) * rowHeight)}px"></tr>`;
+    
+    tbody.innerHTML = html;
+    
+    if (typeof lucide !== 'undefined') {
+        lucide.createIcons();
+    }
+    AdsManager.initNewAds(tbody);
 }
 
 // ✅ 키워드 테이블 렌더링 (광고 삽입 포함)
@@ -210,30 +379,91 @@ function getGradeClass(grade) {
 
 async function loadArchiveList() {
     try {
-        const response = await fetch(CONFIG.api.archiveList);
-        if (!response.ok) throw new Error('아카이브 목록을 불러올 수 없습니다');
-        
-        const files = await response.json();
-        renderArchiveList(files);
+        const entries = await loadRecentArchiveEntries(10);
+        renderArchiveList(entries);
     } catch (error) {
-        console.error('아카이브 로드 실패:', error);
+        // 색인이 없으면 기존 archive_list.json 사용
+        try {
+            const response = await fetchOutput(CONFIG.api.archiveList);
+            if (!response.ok) throw new Error('아카이브 목록을 불러올 수 없습니다');
+            
+            const files = await response.json();
+            renderArchiveList(files.map(file => ({ file })));
+        } catch (fallbackError) {
+            console.error('아카이브 로드 실패:', fallbackError);
+        }
+    }
+}
+
+// ✅ 월별 색인 페이지를 최신 월부터 필요한 만큼만 로드
+async function loadRecentArchiveEntries(limit) {
+    const response = await fetchOutput(CONFIG.api.archiveIndex);
+    if (!response.ok) throw new Error('아카이브 색인을 불러올 수 없습니다');
+    
+    const index = await response.json();
+    const entries = [];
+    
+    for (const month of index.months || []) {
+        if (entries.length >= limit) break;
+        
+        const pageResponse = await fetchOutput(`${CONFIG.api.archiveIndexPath}${month.month}.json`);
+        if (!pageResponse.ok) continue;
+        
+        const page = await pageResponse.json();
+        entries.push(...page.reverse());
+    }
+    
+    return entries.slice(0, limit);
+}
+
+// ✅ 키워드 역색인 (main.py normalize_keyword / keyword_index_shard와 같은 규칙)
+const GRADE_LABELS = ['💎 DIAMOND', '🌟 GOLD', '✨ SILVER', 'Bad'];
+const keywordShardCache = new Map();
+
+function normalizeKeyword(keyword) {
+    return keyword.normalize('NFKC').toLowerCase().replace(/\s+/g, '');
+}
+
+function keywordShardName(key) {
+    return key ? key.codePointAt(0).toString(16).padStart(4, '0') : '0000';
+}
+
+// 키워드의 아카이브별 기록 (시간순): [{ archive, golden_score, grade, rank }]
+async function lookupKeywordHistory(keyword) {
+    const key = normalizeKeyword(keyword);
+    const shard = keywordShardName(key);
+    
+    if (!keywordShardCache.has(shard)) {
+        keywordShardCache.set(shard, fetchOutput(`${CONFIG.api.keywordIndexPath}${shard}.json`)
+            .then(response => response.ok ? response.json() : {})
+            .catch(() => ({})));
     }
+    
+    const entry = (await keywordShardCache.get(shard))[key];
+    if (!entry) return [];
+    return entry.p.map(([archive, golden_score, grade, rank]) => ({
+        archive, golden_score, grade: GRADE_LABELS[grade], rank
+    }));
 }
 
-function renderArchiveList(files) {
+function renderArchiveList(entries) {
     const container = document.getElementById('archive-list');
-    if (!container || !files || files.length === 0) {
+    if (!container || !entries || entries.length === 0) {
         if (container) container.innerHTML = '<li>아카이브가 없습니다.</li>';
         return;
     }
     
-    const html = files.slice(0, 10).map(file => {
-        const displayName = file.replace('.html', '').replace(/_/g, ' ');
+    const html = entries.slice(0, 10).map(entry => {
+        const displayName = entry.file.replace('.html', '').replace(/_/g, ' ');
+        const meta = entry.keyword_count != null
+            ? `<small>${entry.keyword_count}개 · 💎 ${entry.diamond_count}</small>`
+            : '';
         return `
             <li class="archive-item">
-                <a href="${CONFIG.api.archivePath}${file}">
+                <a href="${CONFIG.api.archivePath}${entry.file}">
                     <i data-lucide="file-text"></i>
                     <span>${displayName}</span>
+                    ${meta}
                 </a>
             </li>
         `;
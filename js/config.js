@@ -7,8 +7,14 @@ const CONFIG = {
     },
     api: {
         data: 'output/data.json',
+        dataIndex: 'output/data.index.json',
         archiveList: 'output/archive_list.json',
-        archivePath: 'output/archives/'
+        archiveIndex: 'output/archive_index/index.json',
+        archiveIndexPath: 'output/archive_index/',
+        archivePath: 'output/archives/',
+        keywordIndexPath: 'output/keyword_index/',
+        contentManifest: 'output/content_manifest.json',
+        outputRoot: 'output/'
     },
     ads: {
         enabled: true,
@@ -6,22 +6,169 @@
 """
 
 import os
+import re
+import sys
+import hmac
 import json
-import requests
+import functools
+import gc
+import itertools
+import heapq
+import base64
+import bisect
+import hashlib
+import math
+import operator
+import random
+import time
+import contextlib
+import unicodedata
+import sqlite3
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
+from urllib.parse import urlencode
 
 # 한국 시간대 설정
 KST = timezone(timedelta(hours=9))
 
+# 오프라인 모드 (제공자 클라이언트를 만들지 않고 예시 키워드 + 추정값만 사용, --dry-run이면 자동 활성)
+OFFLINE_MODE = os.environ.get('OFFLINE_MODE', '0') == '1'
+
 # 환경 변수
 NAVER_CLIENT_ID = os.environ.get('NAVER_CLIENT_ID', '')
 NAVER_CLIENT_SECRET = os.environ.get('NAVER_CLIENT_SECRET', '')
 
+# 네이버 오픈 API 클라이언트 설정 (로컬 스텁 서버 테스트 시 BASE_URL 교체)
+NAVER_OPENAPI_BASE_URL = os.environ.get('NAVER_OPENAPI_BASE_URL', 'https://openapi.naver.com')
+NAVER_OPENAPI_DAILY_QUOTA = int(os.environ.get('NAVER_OPENAPI_DAILY_QUOTA', '25000'))
+
+# 네이버 검색광고 API (키워드 도구, 요청당 힌트 키워드 최대 5개)
+NAVER_AD_CUSTOMER_ID = os.environ.get('NAVER_AD_CUSTOMER_ID', '')
+NAVER_AD_ACCESS_KEY = os.environ.get('NAVER_AD_ACCESS_KEY', '')
+NAVER_AD_SECRET_KEY = os.environ.get('NAVER_AD_SECRET_KEY', '')
+NAVER_SEARCHAD_BASE_URL = os.environ.get('NAVER_SEARCHAD_BASE_URL', 'https://api.naver.com')
+NAVER_SEARCHAD_DAILY_QUOTA = int(os.environ.get('NAVER_SEARCHAD_DAILY_QUOTA', '0'))  # 0이면 제한 없음
+SEARCHAD_HINT_BATCH = 5
+RELATED_KEYWORDS_LIMIT = int(os.environ.get('RELATED_KEYWORDS_LIMIT', '10'))  # 키워드당 연관 키워드 수
+
+# 쿠팡 파트너스 Open API (카테고리별 베스트 상품, 로컬 픽스처 서버 테스트 시 BASE_URL 교체)
+COUPANG_ACCESS_KEY = os.environ.get('COUPANG_ACCESS_KEY', '')
+COUPANG_SECRET_KEY = os.environ.get('COUPANG_SECRET_KEY', '')
+COUPANG_BASE_URL = os.environ.get('COUPANG_BASE_URL', 'https://api-gateway.coupang.com')
+COUPANG_DAILY_QUOTA = int(os.environ.get('COUPANG_DAILY_QUOTA', '0'))  # 0이면 제한 없음
+COUPANG_CATEGORIES = [c for c in os.environ.get(
+    'COUPANG_CATEGORIES',
+    '1001,1002,1010,1011,1012,1013,1014,1015,1016,1017,1018,1019,1020,1021,1024,1029,1030'
+).split(',') if c]
+COUPANG_BEST_LIMIT = int(os.environ.get('COUPANG_BEST_LIMIT', '20'))  # 카테고리당 상품 수 (최대 100)
+COUPANG_WORKERS = int(os.environ.get('COUPANG_WORKERS', '4'))  # 동시에 진행할 카테고리 요청 수
+COUPANG_KEYWORD_WORDS = 3  # 상품명에서 키워드로 쓸 앞 단어 수
+
+HTTP_TIMEOUT = 5
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_BASE = 0.5  # 초 단위, 재시도마다 2배
+HTTP_MAX_RETRY_AFTER = 30  # 초 단위, 서버가 보낸 Retry-After 대기 상한
+
+# 동시 조회 설정 (키워드 단위 병렬 처리, 입력은 묶음 단위로 받아 수집과 겹쳐 진행)
+ENRICH_WORKERS = int(os.environ.get('ENRICH_WORKERS', '8'))
+ANALYZE_CHUNK_SIZE = int(os.environ.get('ANALYZE_CHUNK_SIZE', '100'))
+# 샤드 모드: 키워드를 해시로 나눠 N개 프로세스에서 분석/채점 (1이면 단일 프로세스, --shards로 지정)
+ANALYZE_SHARDS = int(os.environ.get('ANALYZE_SHARDS', '1'))
+
+# 제공자별 초당 최대 요청 수 (0 이하면 제한 없음)
+PROVIDER_RATE_LIMITS = {
+    'search_volume': float(os.environ.get('RATE_LIMIT_SEARCH_VOLUME', '10')),
+    'blog_count': float(os.environ.get('RATE_LIMIT_BLOG_COUNT', '10')),
+    'related_keywords': float(os.environ.get('RATE_LIMIT_RELATED', '5')),
+    'coupang': float(os.environ.get('RATE_LIMIT_COUPANG', '5')),
+}
+# 제공자별 토큰 버킷 크기 (연속 허용 요청 수)
+PROVIDER_BURSTS = {
+    'search_volume': int(os.environ.get('RATE_BURST_SEARCH_VOLUME', '5')),
+    'blog_count': int(os.environ.get('RATE_BURST_BLOG_COUNT', '5')),
+    'related_keywords': int(os.environ.get('RATE_BURST_RELATED', '2')),
+}
+
+# 요청 우선순위 (수집 키워드 먼저, 확장 롱테일은 일일 한도 여유가 있을 때만)
+PRIORITY_HEAD = 0
+PRIORITY_TAIL = 1
+QUOTA_TAIL_RESERVE = float(os.environ.get('QUOTA_TAIL_RESERVE', '0.2'))  # 롱테일이 남겨 둘 일일 한도 비율
+
 # 출력 경로
 OUTPUT_DIR = Path('output')
 ARCHIVE_DIR = OUTPUT_DIR / 'archives'
 
+# 키워드 이력 저장소 (추세 계산용, 일/주 단위 변화량)
+HISTORY_ENABLED = os.environ.get('KEYWORD_HISTORY', '1') != '0'
+HISTORY_PATH = OUTPUT_DIR / 'history.sqlite3'
+TREND_WINDOWS_DAYS = (1, 7)
+
+# 증분 재분석 (이전 data.json 결과 재사용)
+INCREMENTAL_ENABLED = os.environ.get('INCREMENTAL', '0') == '1'
+INCREMENTAL_MAX_AGE_HOURS = float(os.environ.get('INCREMENTAL_MAX_AGE_HOURS', '24'))
+INCREMENTAL_VOLATILITY = float(os.environ.get('INCREMENTAL_VOLATILITY', '0.3'))  # 1일 검색량 변화율
+
+# 연관 키워드 확장 (황금지수 우선 너비 탐색)
+EXPANSION_ENABLED = os.environ.get('EXPAND_KEYWORDS', '0') == '1'
+EXPANSION_MAX_DEPTH = int(os.environ.get('EXPANSION_MAX_DEPTH', '2'))
+EXPANSION_BUDGET = int(os.environ.get('EXPANSION_BUDGET', '20000'))  # 새로 분석할 최대 키워드 수
+EXPANSION_BATCH = int(os.environ.get('EXPANSION_BATCH', '50'))
+EXPANSION_CHECKPOINT_PATH = OUTPUT_DIR / 'expansion_checkpoint.json'
+EXPANSION_CHECKPOINT_MAX_AGE_HOURS = float(os.environ.get('EXPANSION_CHECKPOINT_MAX_AGE_HOURS', '6'))  # 넘으면 새로 시작
+BLOOM_THRESHOLD = 100000  # 예상 방문 수가 이 이상이면 블룸 필터 사용
+
+# 자격 증명별 일일 사용량 (KST 날짜 기준, 실행 간 누적) / 한도로 다음 실행에 넘긴 키워드
+QUOTA_PATH = OUTPUT_DIR / 'quota.json'
+DEFERRED_PATH = OUTPUT_DIR / 'deferred.json'
+
+# 분석 진행 저널 (중단된 실행을 --resume으로 이어서 진행)
+RUN_JOURNAL_PATH = OUTPUT_DIR / 'checkpoint.jsonl'
+JOURNAL_FSYNC_EVERY = int(os.environ.get('JOURNAL_FSYNC_EVERY', '50'))  # 레코드 N개마다 디스크 동기화
+JOURNAL_MAX_AGE_HOURS = float(os.environ.get('JOURNAL_MAX_AGE_HOURS', '24'))  # 이보다 오래된 기록은 재조회
+
+# 실행 지표 수집 (기본 비활성, run_metrics.json / run_profile.prof)
+RUN_METRICS = os.environ.get('RUN_METRICS', '0') == '1'
+RUN_PROFILE = os.environ.get('RUN_PROFILE', '0') == '1'
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# 상위 N개 순위 기본 크기
+TOP_PAGE_SIZE = int(os.environ.get('TOP_PAGE_SIZE', '50'))
+
+# 대시보드 가상 스크롤용 출력 (정렬 순열 data.index.json + 고정 크기 행 묶음 data_chunks/NNNN.json)
+ROW_CHUNK_SIZE = int(os.environ.get('ROW_CHUNK_SIZE', '200'))
+ROW_CHUNK_DIR = OUTPUT_DIR / 'data_chunks'
+SORTABLE_COLUMNS = ('golden_score', 'efficiency', 'search_volume', 'blog_count')
+
+# 내용 해시 매니페스트 (output/content_manifest.json, 내용이 같은 출력물은 다시 쓰지 않고 프런트엔드는 ?v=해시로 캐시)
+CONTENT_MANIFEST_NAME = 'content_manifest.json'
+# 실행마다 바뀌는 생성 시각은 해시에서 제외 (키워드별 fetched_at은 증분 모드의 신선도 판단에 쓰이므로 포함)
+CONTENT_VOLATILE_KEYS = ('generated_at',)
+
+# 아카이브 원본 데이터 (재렌더링용)
+ARCHIVE_DATA_DIR = OUTPUT_DIR / 'archive_data'
+
+# 아카이브 색인 (월별 페이지, 최근 목록은 archive_list.json에 유지)
+ARCHIVE_INDEX_DIR = OUTPUT_DIR / 'archive_index'
+ARCHIVE_LIST_LIMIT = 30
+
+# 키워드 역색인 (정규화 키워드 → 아카이브별 점수/등급/순위, 첫 글자별 JSON 샤드)
+KEYWORD_INDEX_DIR = OUTPUT_DIR / 'keyword_index'
+KEYWORD_INDEX_ARCHIVES_NAME = 'archives.json'  # 아카이브별 항목이 들어 있는 샤드 목록 (재실행 시 이전 항목 제거용)
+
+# 조회 캐시 설정 (지표별 TTL, 초 단위)
+CACHE_ENABLED = os.environ.get('LOOKUP_CACHE', '1') != '0'
+CACHE_PATH = OUTPUT_DIR / 'lookup_cache.sqlite3'
+CACHE_MAX_ENTRIES = int(os.environ.get('LOOKUP_CACHE_MAX_ENTRIES', '50000'))
+CACHE_COMMIT_EVERY = int(os.environ.get('LOOKUP_CACHE_COMMIT_EVERY', '50'))  # 값 N개마다 커밋 (중단돼도 조회분 보존)
+CACHE_TTL = {
+    'search_volume': 7 * 24 * 3600,  # 월간 검색량은 거의 변하지 않음
+    'blog_count': 12 * 3600,
+    'related_keywords': 3 * 24 * 3600,
+}
+
 # AdSense 설정
 ADSENSE_CLIENT = 'ca-pub-6677996696534146'
 ADSENSE_SLOT = '7736105857'
@@ -31,6 +178,10 @@ def ensure_directories():
     """필요한 디렉토리 생성"""
     OUTPUT_DIR.mkdir(exist_ok=True)
     ARCHIVE_DIR.mkdir(exist_ok=True)
+    ARCHIVE_INDEX_DIR.mkdir(exist_ok=True)
+    ARCHIVE_DATA_DIR.mkdir(exist_ok=True)
+    KEYWORD_INDEX_DIR.mkdir(exist_ok=True)
+    ROW_CHUNK_DIR.mkdir(exist_ok=True)
 
 
 def get_naver_shopping_keywords():
@@ -55,154 +206,1880 @@ def get_naver_shopping_keywords():
     return keywords
 
 
-def get_coupang_trending_keywords():
-    """쿠팡 트렌딩 키워드 수집"""
-    keywords = []
-    
-    # 쿠팡 트렌딩 키워드 (예시 데이터)
-    sample_keywords = [
-        '로봇청소기', '공기청정기', '무선청소기',
-        '전기포트', '믹서기', '에어프라이어',
-        '캠핑의자', '텐트', '침낭',
-        '운동화', '등산화', '런닝화'
-    ]
-    
-    for kw in sample_keywords:
-        keywords.append({
-            'keyword': kw,
-            'source': 'COUPANG'
-        })
-    
-    return keywords
+def iter_coupang_trending_keywords(categories=None, workers=None, stats=None):
+    """쿠팡 트렌딩 키워드를 도착 순서대로 생성 (카테고리 베스트 상품명 기준, 자격 증명 없으면 예시 데이터)"""
+    stats = {} if stats is None else stats
+    stats.setdefault('keywords', 0)
+    client = get_coupang_client()
+    
+    if client is None:
+        # 쿠팡 트렌딩 키워드 (예시 데이터)
+        sample_keywords = [
+            '로봇청소기', '공기청정기', '무선청소기',
+            '전기포트', '믹서기', '에어프라이어',
+            '캠핑의자', '텐트', '침낭',
+            '운동화', '등산화', '런닝화'
+        ]
+        for kw in sample_keywords:
+            stats['keywords'] += 1
+            yield {'keyword': kw, 'source': 'COUPANG'}
+        return
+    
+    products = iter_coupang_best_products(client, COUPANG_CATEGORIES if categories is None else categories,
+                                          workers, stats=stats)
+    for product in products:
+        keyword = coupang_product_keyword(product.get('productName', ''))
+        if keyword:
+            stats['keywords'] += 1
+            yield {'keyword': keyword, 'source': 'COUPANG'}
+
+
+class ProviderError(Exception):
+    """외부 제공자 조회 실패 (추정값으로 대체해야 함)"""
+
+
+class QuotaExceededError(ProviderError):
+    """일일 호출 한도 초과"""
+
+
+class ProviderClient:
+    """외부 API 공통 클라이언트 (keep-alive 세션 풀 + 429/5xx 지수 백오프 + 일일 한도)"""
+
+    RETRY_STATUS = {429, 500, 502, 503, 504}
+    QUOTA_KEY = None  # 설정 시 일일 사용량을 SCHEDULER 장부에 누적
+    RATE_LIMIT_KEY = None  # 설정 시 재시도 전에 SCHEDULER의 해당 제공자 토큰 버킷을 기다림
+
+    def __init__(self, base_url, daily_quota=0, pool_size=None, max_retries=None, backoff_base=None,
+                 limiter=None):
+        self.base_url = base_url.rstrip('/')
+        self.daily_quota = daily_quota
+        if self.QUOTA_KEY:
+            SCHEDULER.register(self.QUOTA_KEY, daily_quota)
+        self.max_retries = HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = HTTP_BACKOFF_BASE if backoff_base is None else backoff_base
+        self.limiter = limiter
+        self.calls = 0
+        self._lock = threading.Lock()
+
+        # requests는 자격 증명이 있는 제공자를 처음 만들 때만 로드 (시작 시간 절약)
+        import requests
+        pool_size = pool_size or max(ENRICH_WORKERS, 1)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _reserve_call(self):
+        """일일 한도 내에서 호출 1회 예약 (자격 증명 단위 장부가 있으면 이전 실행 사용량 포함)"""
+        if self.QUOTA_KEY:
+            SCHEDULER.reserve(self.QUOTA_KEY)
+        with self._lock:
+            if not self.QUOTA_KEY and self.daily_quota and self.calls >= self.daily_quota:
+                raise QuotaExceededError(f"일일 호출 한도 {self.daily_quota}회 초과")
+            self.calls += 1
+
+    def _wait_for_retry(self):
+        """재시도 요청도 첫 요청과 같은 토큰 버킷을 거침 (지정한 limiter가 없으면 SCHEDULER 공유 버킷)"""
+        limiter = self.limiter
+        if limiter is None and self.RATE_LIMIT_KEY:
+            limiter = SCHEDULER.limiters().get(self.RATE_LIMIT_KEY)
+        if limiter is not None:
+            limiter.wait()
+
+    def request_headers(self, method, path, query=''):
+        """요청별 추가 헤더 (서명이 필요한 API에서 재정의, query는 인코딩된 쿼리 문자열)"""
+        return None
+
+    def get_json(self, path, params):
+        """GET 요청 (재시도 대상 상태코드/네트워크 오류는 지수 백오프, Retry-After가 있으면 그 시간만 대기)"""
+        import requests
+        # 서명과 실제 요청이 같은 쿼리 문자열을 쓰도록 직접 인코딩
+        query = urlencode(params or {}, doseq=True)
+        url = f"{self.base_url}{path}" + (f"?{query}" if query else '')
+        last_error = None
+        retry_after = None
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                # 서버가 지정한 대기 시간은 백오프에 더하지 않고 대신 사용 (상한 적용)
+                if retry_after is None:
+                    time.sleep(self.backoff_base * (2 ** (attempt - 1)))
+                else:
+                    time.sleep(min(retry_after, HTTP_MAX_RETRY_AFTER))
+                retry_after = None
+                self._wait_for_retry()
+            self._reserve_call()
+
+            try:
+                response = self.session.get(url, timeout=HTTP_TIMEOUT,
+                                            headers=self.request_headers('GET', path, query))
+            except requests.RequestException as e:
+                last_error = e
+                continue
+
+            if response.status_code == 200:
+                # 프록시 오류 페이지 등 JSON 객체가 아닌 본문은 일시 오류로 보고 재시도
+                try:
+                    data = response.json()
+                except ValueError:
+                    data = None
+                if isinstance(data, dict):
+                    return data
+                last_error = "JSON 객체가 아닌 응답"
+                continue
+            last_error = f"HTTP {response.status_code}"
+            if response.status_code not in self.RETRY_STATUS:
+                break
+
+            header = response.headers.get('Retry-After', '')
+            if header.isdigit():
+                retry_after = int(header)
+
+        raise ProviderError(f"{path} 조회 실패: {last_error}")
+
+    def close(self):
+        self.session.close()
+
+
+class NaverOpenApiClient(ProviderClient):
+    """네이버 오픈 API 클라이언트 (블로그 검색)"""
+
+    QUOTA_KEY = 'naver_openapi'
+    RATE_LIMIT_KEY = 'blog_count'
+
+    def __init__(self, client_id, client_secret, base_url=None, daily_quota=None, **kwargs):
+        super().__init__(base_url or NAVER_OPENAPI_BASE_URL,
+                         NAVER_OPENAPI_DAILY_QUOTA if daily_quota is None else daily_quota, **kwargs)
+        self.session.headers.update({
+            "X-Naver-Client-Id": client_id,
+            "X-Naver-Client-Secret": client_secret
+        })
+
+    def blog_total(self, keyword):
+        """블로그 검색 결과 총 건수"""
+        data = self.get_json('/v1/search/blog.json', {"query": keyword, "display": 1})
+        return data.get('total', 0)
+
+
+def _parse_search_count(value):
+    """검색광고 API 조회수 값 ('< 10' 같은 문자열 포함)"""
+    if isinstance(value, (int, float)):
+        return int(value)
+    # 10 미만은 '< 10' 문자열로 내려옴
+    return 5 if '<' in str(value) else int(str(value).replace(',', '') or 0)
+
+
+class NaverSearchAdClient(ProviderClient):
+    """네이버 검색광고 API 클라이언트 (키워드 도구 월간 검색량, HMAC 서명)"""
+
+    KEYWORD_TOOL_PATH = '/keywordstool'
+    QUOTA_KEY = 'naver_searchad'
+    RATE_LIMIT_KEY = 'search_volume'
+
+    def __init__(self, customer_id, access_key, secret_key, base_url=None, daily_quota=None, **kwargs):
+        super().__init__(base_url or NAVER_SEARCHAD_BASE_URL,
+                         NAVER_SEARCHAD_DAILY_QUOTA if daily_quota is None else daily_quota, **kwargs)
+        self.customer_id = str(customer_id)
+        self.access_key = access_key
+        self.secret_key = secret_key.encode('utf-8')
+
+    def sign(self, timestamp, method, path):
+        """X-Signature: base64(HMAC-SHA256(secret, '{timestamp}.{method}.{path}'))"""
+        message = f"{timestamp}.{method}.{path}".encode('utf-8')
+        return base64.b64encode(hmac.new(self.secret_key, message, hashlib.sha256).digest()).decode('ascii')
+
+    def request_headers(self, method, path, query=''):
+        timestamp = str(int(time.time() * 1000))
+        return {
+            'X-Timestamp': timestamp,
+            'X-API-KEY': self.access_key,
+            'X-Customer': self.customer_id,
+            'X-Signature': self.sign(timestamp, method, path),
+        }
+
+    def keyword_rows(self, keywords):
+        """힌트 키워드(최대 5개) 1회 조회, 응답 순서대로 [(정규화 키워드, 표기, PC+모바일 월간 검색량)]
+
+        응답에는 힌트 자신과 연관 키워드 행이 힌트 구분 없이 섞여 있음"""
+        # 힌트 키워드는 공백을 허용하지 않음
+        hints = ','.join(''.join(kw.split()) for kw in keywords)
+        data = self.get_json(self.KEYWORD_TOOL_PATH, {'hintKeywords': hints, 'showDetail': 1})
+        rows = []
+        for row in data.get('keywordList', []):
+            keyword = row.get('relKeyword', '')
+            rows.append((normalize_keyword(keyword), keyword,
+                         _parse_search_count(row.get('monthlyPcQcCnt', 0)) +
+                         _parse_search_count(row.get('monthlyMobileQcCnt', 0))))
+        return rows
+
+    def keyword_volumes(self, keywords):
+        """힌트 키워드(최대 5개) 1회 조회, {정규화 키워드: PC+모바일 월간 검색량}"""
+        return {key: volume for key, _, volume in self.keyword_rows(keywords)}
+
+    def related_keywords(self, keyword, limit=None):
+        """힌트 1개로 조회한 연관 키워드 (응답 순서)"""
+        return attribute_related_keywords([keyword], self.keyword_rows([keyword]), limit)[normalize_keyword(keyword)]
+
+    def search_volumes(self, keywords, workers=None, limiter=None, related=None):
+        """키워드를 5개씩 묶어 병렬 조회, {키워드: 검색량 또는 None(조회 실패/결과 없음)}
+
+        related(dict)를 넘기면 같은 응답의 연관 키워드 행도 {키워드: [연관 키워드]}로 채움.
+        일일 한도로 조회하지 못한 묶음의 키워드는 결과에서 빠짐 (단건 조회 단계에서 이월 처리)"""
+        workers = ENRICH_WORKERS if workers is None else workers
+        keys = {}
+        for kw in keywords:
+            keys.setdefault(normalize_keyword(kw), kw)
+        unique = list(keys.values())
+        batches = [unique[i:i + SEARCHAD_HINT_BATCH] for i in range(0, len(unique), SEARCHAD_HINT_BATCH)]
+
+        def run_batch(batch):
+            if limiter is not None:
+                limiter.wait()
+            started = time.perf_counter()
+            try:
+                rows = self.keyword_rows(batch)
+            except QuotaExceededError as e:
+                METRICS.count(f'search_volume.{type(e).__name__}')
+                skipped.update(normalize_keyword(kw) for kw in batch)
+                return {}, {}
+            except ProviderError as e:
+                METRICS.count(f'search_volume.{type(e).__name__}')
+                return {}, {}
+            finally:
+                METRICS.observe('search_volume', started)
+            return ({key: volume for key, _, volume in rows},
+                    attribute_related_keywords(batch, rows) if related is not None else {})
+
+        merged = {}
+        merged_related = {}
+        skipped = set()
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(batches) or 1))) as executor:
+            for volumes, batch_related in executor.map(run_batch, batches):
+                merged.update(volumes)
+                merged_related.update(batch_related)
+
+        if related is not None:
+            related.update((kw, merged_related[normalize_keyword(kw)]) for kw in keywords
+                           if normalize_keyword(kw) in merged_related)
+        return {kw: merged.get(normalize_keyword(kw)) for kw in keywords
+                if normalize_keyword(kw) not in skipped}
+
+
+def attribute_related_keywords(keywords, rows, limit=None):
+    """키워드 도구 응답의 연관 키워드 행을 힌트별로 배분, {정규화 힌트: [연관 키워드 표기]}
+
+    힌트가 1개면 힌트 외 모든 행, 여러 개면 응답이 합쳐져 오므로 힌트를 포함하는 행만 해당 힌트에 배분"""
+    limit = RELATED_KEYWORDS_LIMIT if limit is None else limit
+    hints = [normalize_keyword(kw) for kw in keywords]
+    related = {hint: [] for hint in hints}
+    for key, keyword, _ in rows:
+        if not key or key in related:
+            continue
+        owners = hints if len(hints) == 1 else [hint for hint in hints if hint in key]
+        for hint in owners:
+            if len(related[hint]) < limit:
+                related[hint].append(keyword)
+    return related
+
+
+class CoupangPartnersClient(ProviderClient):
+    """쿠팡 파트너스 Open API 클라이언트 (카테고리별 베스트 상품, CEA HMAC 서명)"""
+
+    BEST_CATEGORIES_PATH = '/v2/providers/affiliate_open_api/apis/openapi/products/bestcategories/{category_id}'
+    QUOTA_KEY = 'coupang'
+    RATE_LIMIT_KEY = 'coupang'
+
+    def __init__(self, access_key, secret_key, base_url=None, daily_quota=None, **kwargs):
+        super().__init__(base_url or COUPANG_BASE_URL,
+                         COUPANG_DAILY_QUOTA if daily_quota is None else daily_quota, **kwargs)
+        self.access_key = access_key
+        self.secret_key = secret_key.encode('utf-8')
+
+    def sign(self, signed_date, method, path, query):
+        """signature: hex(HMAC-SHA256(secret, '{signed_date}{method}{path}{query}'))"""
+        message = f"{signed_date}{method}{path}{query}".encode('utf-8')
+        return hmac.new(self.secret_key, message, hashlib.sha256).hexdigest()
+
+    def request_headers(self, method, path, query=''):
+        signed_date = time.strftime('%y%m%dT%H%M%SZ', time.gmtime())
+        return {
+            'Authorization': (f"CEA algorithm=HmacSHA256, access-key={self.access_key}, "
+                              f"signed-date={signed_date}, signature={self.sign(signed_date, method, path, query)}"),
+        }
+
+    def best_products(self, category_id, limit=None):
+        """카테고리 베스트 상품 목록 (순위순)"""
+        limit = COUPANG_BEST_LIMIT if limit is None else limit
+        data = self.get_json(self.BEST_CATEGORIES_PATH.format(category_id=category_id), {'limit': limit})
+        if str(data.get('rCode', '0')) != '0':
+            raise ProviderError(f"쿠팡 카테고리 {category_id} 조회 실패: {data.get('rMessage')}")
+        return data.get('data') or []
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def _shared_client(name, factory):
+    """제공자 클라이언트 1회 생성 후 공유 (오프라인 모드면 None)"""
+    if OFFLINE_MODE:
+        return None
+    with _clients_lock:
+        if name not in _clients:
+            _clients[name] = factory()
+    return _clients[name]
+
+
+def get_naver_openapi_client():
+    """공유 네이버 오픈 API 클라이언트 (자격 증명 없으면 None)"""
+    if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
+        return None
+    return _shared_client('naver_openapi',
+                          lambda: NaverOpenApiClient(NAVER_CLIENT_ID, NAVER_CLIENT_SECRET))
+
+
+def get_naver_searchad_client():
+    """공유 네이버 검색광고 API 클라이언트 (자격 증명 없으면 None)"""
+    if not (NAVER_AD_CUSTOMER_ID and NAVER_AD_ACCESS_KEY and NAVER_AD_SECRET_KEY):
+        return None
+    return _shared_client('naver_searchad', lambda: NaverSearchAdClient(
+        NAVER_AD_CUSTOMER_ID, NAVER_AD_ACCESS_KEY, NAVER_AD_SECRET_KEY))
+
+
+def get_coupang_client():
+    """공유 쿠팡 파트너스 API 클라이언트 (자격 증명 없으면 None)"""
+    if not COUPANG_ACCESS_KEY or not COUPANG_SECRET_KEY:
+        return None
+    return _shared_client('coupang', lambda: CoupangPartnersClient(COUPANG_ACCESS_KEY, COUPANG_SECRET_KEY))
+
+
+def iter_coupang_best_products(client, categories, workers=None, stats=None):
+    """카테고리별 베스트 상품을 병렬 조회해 응답 도착 순서대로 생성
+
+    요청은 소비 속도에 맞춰 최대 workers개만 진행 (생성기를 끝까지 읽지 않으면 남은 카테고리는 조회 안 함)"""
+    workers = COUPANG_WORKERS if workers is None else workers
+    stats = {} if stats is None else stats
+    stats.setdefault('categories', 0)
+    stats.setdefault('failed', 0)
+    limiter = SCHEDULER.limiters()['coupang']
+    remaining = iter(categories)
+
+    def fetch(category_id):
+        limiter.wait()
+        started = time.perf_counter()
+        try:
+            return client.best_products(category_id)
+        finally:
+            METRICS.observe('coupang', started)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        in_flight = {}
+
+        def submit_next():
+            for category_id in remaining:
+                in_flight[executor.submit(fetch, category_id)] = category_id
+                return
+
+        for _ in range(max(1, workers)):
+            submit_next()
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                category_id = in_flight.pop(future)
+                try:
+                    products = future.result()
+                except QuotaExceededError as e:
+                    # 한도 초과: 남은 카테고리는 요청하지 않음
+                    METRICS.count(f'coupang.{type(e).__name__}')
+                    print(f"   - ⚠️ 쿠팡 {e}, 남은 카테고리 생략")
+                    remaining = iter(())
+                    stats['failed'] += 1
+                    continue
+                except ProviderError as e:
+                    METRICS.count(f'coupang.{type(e).__name__}')
+                    print(f"   - ⚠️ {e}")
+                    stats['failed'] += 1
+                    submit_next()
+                    continue
+                stats['categories'] += 1
+                submit_next()
+                yield from products
+
+
+def coupang_product_keyword(product_name, max_words=None):
+    """상품명에서 검색 키워드 추출 (괄호 안 설명, 숫자가 섞인 모델명/용량/수량 단어 제외 후 앞 단어 몇 개)"""
+    max_words = COUPANG_KEYWORD_WORDS if max_words is None else max_words
+    name = re.sub(r'\[[^\]]*\]|\([^)]*\)', ' ', product_name)
+    words = [word for word in re.split(r'[\s,/+]+', name) if word and not re.search(r'\d', word)]
+    return ' '.join(words[:max_words])
+
+
+def fetch_search_volume(keyword):
+    """네이버 검색광고 API로 검색량 조회 (단건, 대량 조회는 prefetch_search_volumes)"""
+    client = get_naver_searchad_client()
+    if client is None:
+        raise ProviderError("네이버 검색광고 API 자격 증명 없음")
+    volume = client.keyword_volumes([keyword]).get(normalize_keyword(keyword))
+    if volume is None:
+        raise ProviderError(f"검색량 결과 없음: {keyword}")
+    return volume
+
+
+def estimate_search_volume(keyword):
+    """검색량 추정값 (조회 실패 시 대체)"""
+    return random.randint(10000, 500000)
+
+
+def fetch_blog_count(keyword):
+    """네이버 블로그 검색 결과 수 조회"""
+    client = get_naver_openapi_client()
+    if client is None:
+        raise ProviderError("네이버 오픈 API 자격 증명 없음")
+    return client.blog_total(keyword)
+
+
+def estimate_blog_count(keyword):
+    """블로그 수 추정값 (조회 실패 시 대체)"""
+    return random.randint(5000, 100000)
+
+
+def normalize_keyword(keyword):
+    """중복 판정용 정규화 키 (NFKC로 전각→반각, 소문자, 공백 제거)"""
+    return ''.join(unicodedata.normalize('NFKC', keyword).lower().split())
+
+
+def iter_dedupe_keywords(keywords, stats=None):
+    """정규화 키 해시 색인으로 중복 키워드를 걸러 첫 표기만 바로 생성
+
+    이후 중복의 출처는 이미 생성한 레코드의 sources 목록에 누적 (분석 중인 레코드도 같은 목록을 공유)"""
+    stats = {} if stats is None else stats
+    stats.update(candidates=0, duplicates=0)
+    index = {}
+
+    for item in keywords:
+        stats['candidates'] += 1
+        key = normalize_keyword(item['keyword'])
+        existing = index.get(key)
+        if existing is None:
+            record = dict(item, sources=list(item.get('sources', [item['source']])))
+            index[key] = record
+            yield record
+            continue
+        stats['duplicates'] += 1
+        for source in item.get('sources', [item['source']]):
+            if source not in existing['sources']:
+                existing['sources'].append(source)
+
+
+def dedupe_keywords(keywords):
+    """정규화 키 해시 색인으로 중복 키워드 병합 (첫 표기 유지, 출처 목록 누적)"""
+    return list(iter_dedupe_keywords(keywords))
+
+
+def iter_chunks(items, size):
+    """반복자를 size개씩 묶어 생성 (전체 목록을 미리 만들지 않음)"""
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def fetch_related_keywords(keyword):
+    """네이버 검색광고 키워드 도구의 연관 키워드 (단건, 대량 조회 응답에 있던 키워드는 prefetch에서 확보)"""
+    client = get_naver_searchad_client()
+    if client is None:
+        raise ProviderError("네이버 검색광고 API 자격 증명 없음")
+    return client.related_keywords(keyword)
+
+
+def estimate_related_keywords(keyword):
+    """연관 키워드 대체값 (조회 실패 시 확장 없음)"""
+    return []
+
+
+# 제공자별 (조회 함수, 추정 함수) - 추정 함수가 None이면 실패 시 빈 값 대신 예외 전파
+PROVIDERS = {
+    'search_volume': (fetch_search_volume, estimate_search_volume),
+    'blog_count': (fetch_blog_count, estimate_blog_count),
+    'related_keywords': (fetch_related_keywords, estimate_related_keywords),
+}
+
+
+def calculate_golden_score(search_volume, blog_count):
+    """황금지수 계산"""
+    if blog_count == 0:
+        return 100.0
+    
+    efficiency = blog_count / search_volume if search_volume > 0 else 999
+    
+    # 황금지수 공식: 검색량이 높고 경쟁이 낮을수록 높은 점수
+    if efficiency < 0.1:
+        base_score = 90
+    elif efficiency < 0.5:
+        base_score = 70
+    elif efficiency < 1.0:
+        base_score = 50
+    elif efficiency < 3.0:
+        base_score = 30
+    else:
+        base_score = 10
+    
+    # 검색량 보너스
+    if search_volume > 100000:
+        base_score += 10
+    elif search_volume > 50000:
+        base_score += 5
+    
+    return min(100, base_score)
+
+
+# 등급 라벨 (등급 코드 = 인덱스)
+GRADE_LABELS = ('💎 DIAMOND', '🌟 GOLD', '✨ SILVER', 'Bad')
+
+
+def get_grade(score):
+    """황금지수에 따른 등급 산정"""
+    if score >= 80:
+        return GRADE_LABELS[0]
+    elif score >= 60:
+        return GRADE_LABELS[1]
+    elif score >= 40:
+        return GRADE_LABELS[2]
+    else:
+        return GRADE_LABELS[3]
+
+
+def score_batch(search_volumes, blog_counts):
+    """검색량/블로그수 배열을 한 번에 점수화 (calculate_golden_score/get_grade와 동일 결과)"""
+    import numpy as np
+
+    sv = np.asarray(search_volumes, dtype=np.float64)
+    bc = np.asarray(blog_counts, dtype=np.float64)
+    has_volume = sv > 0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(has_volume, bc / np.where(has_volume, sv, 1.0), 999.0)
+
+    base = np.select([ratio < 0.1, ratio < 0.5, ratio < 1.0, ratio < 3.0], [90, 70, 50, 30], 10)
+    base += np.select([sv > 100000, sv > 50000], [10, 5], 0)
+    score = np.where(bc == 0, 100, np.minimum(base, 100))
+    grade_code = np.select([score >= 80, score >= 60, score >= 40], [0, 1, 2], 3)
+
+    # 경쟁강도 반올림: np.round는 x.xx5 경계에서 round()와 다를 수 있어 경계값만 보정
+    efficiency = np.round(ratio, 2)
+    scaled = ratio * 100
+    near_half = has_volume & (np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    for i in np.flatnonzero(near_half):
+        efficiency[i] = round(float(ratio[i]), 2)
+    efficiency = np.where(has_volume, efficiency, 999.99)
+
+    return {
+        'efficiency': efficiency,
+        'golden_score': score,
+        'grade_code': grade_code,
+        'zero_blog': bc == 0,
+    }
+
+
+class KeywordRecord:
+    """키워드 분석 결과 (__slots__ + 공유/인턴 값으로 대량 실행 시 메모리 절약, dict처럼 접근)"""
+
+    # 항상 출력하는 필드 (trend는 값이 있을 때만 출력하므로 따로 추가)
+    _FIELDS = ('keyword', 'source', 'sources', 'search_volume', 'blog_count', 'efficiency',
+               'golden_score', 'grade', 'related_keywords', 'estimated', 'fetched_at')
+    __slots__ = _FIELDS + ('trend',)
+
+    # 출처 조합/추정 항목 조합은 종류가 적으므로 튜플 하나를 공유
+    _shared = {}
+
+    def __init__(self, keyword, source, sources, search_volume, blog_count, efficiency,
+                 golden_score, grade, related_keywords=(), estimated=(), fetched_at=None, trend=None):
+        self.keyword = keyword
+        self.source = sys.intern(source)
+        self.sources = self._share(sources)
+        self.search_volume = search_volume
+        self.blog_count = blog_count
+        self.efficiency = efficiency
+        self.golden_score = golden_score
+        self.grade = sys.intern(grade)
+        self.related_keywords = tuple(related_keywords) if related_keywords else ()
+        self.estimated = self._share(estimated)
+        self.fetched_at = sys.intern(fetched_at) if fetched_at else None
+        self.trend = trend or None
+
+    @classmethod
+    def _share(cls, values):
+        values = tuple(sys.intern(v) for v in values)
+        return cls._shared.setdefault(values, values)
+
+    @classmethod
+    def from_dict(cls, data, **overrides):
+        """data.json 형식 dict에서 생성"""
+        fields = {name: data[name] for name in cls.__slots__ if name in data}
+        fields.update(overrides)
+        fields.setdefault('sources', [fields['source']])
+        return cls(**fields)
+
+    def to_dict(self):
+        """JSON 출력용 dict (값이 없는 trend는 생략)"""
+        data = {name: getattr(self, name) for name in self._FIELDS}
+        data['sources'] = list(self.sources)
+        data['related_keywords'] = list(self.related_keywords)
+        data['estimated'] = list(self.estimated)
+        if self.trend:
+            data['trend'] = self.trend
+        return data
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.__slots__ and getattr(self, key) is not None
+
+    def get(self, key, default=None):
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def __eq__(self, other):
+        if isinstance(other, KeywordRecord):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __repr__(self):
+        return f"KeywordRecord({self.to_dict()!r})"
+
+    def __reduce__(self):
+        # 샤드 프로세스 간 전달: 필드 튜플만 보내고 받는 쪽은 __init__ 없이 복원 (공유 튜플/문자열은 pickle 메모로 유지)
+        return _restore_record, (_record_fields(self),)
+
+
+_record_fields = operator.attrgetter(*KeywordRecord.__slots__)
+
+
+def _restore_record(values):
+    """pickle된 KeywordRecord 복원 (부모 프로세스의 직렬 구간이므로 검증/인턴 생략)"""
+    record = object.__new__(KeywordRecord)
+    (record.keyword, record.source, record.sources, record.search_volume, record.blog_count,
+     record.efficiency, record.golden_score, record.grade, record.related_keywords, record.estimated,
+     record.fetched_at, record.trend) = values
+    return record
+
+
+def json_default(obj):
+    """json.dump 기본 변환 (KeywordRecord → dict)"""
+    if isinstance(obj, KeywordRecord):
+        return obj.to_dict()
+    raise TypeError(f"JSON으로 변환할 수 없는 타입: {type(obj).__name__}")
+
+
+def score_records(records):
+    """수집된 원시 레코드 목록에 경쟁강도/황금지수/등급을 일괄 부여 (KeywordRecord 목록)"""
+    if not records:
+        return []
+
+    scored = score_batch([r['search_volume'] for r in records],
+                         [r['blog_count'] for r in records])
+    efficiency = scored['efficiency'].tolist()
+    golden_score = scored['golden_score'].tolist()
+    grade_code = scored['grade_code'].tolist()
+    zero_blog = scored['zero_blog'].tolist()
+
+    results = []
+    for i, r in enumerate(records):
+        results.append(KeywordRecord(
+            r['keyword'],
+            r['source'],
+            r['sources'],
+            r['search_volume'],
+            r['blog_count'],
+            efficiency[i],
+            # 스칼라 경로와 동일하게 블로그 0건일 때만 실수(100.0)
+            100.0 if zero_blog[i] else int(golden_score[i]),
+            GRADE_LABELS[grade_code[i]],
+            r['related_keywords'],
+            r['estimated'],
+            r.get('fetched_at')
+        ))
+    return results
+
+
+# 요약/총평에 쓰는 항목별 상위 키워드 수 (top: 전체 황금지수 순위)
+SUMMARY_HEAD_SIZES = {'top': 5, 'diamond': 3, 'gold': 3, 'silver': 3, 'blueocean': 5}
+
+
+def rank_results(results, k=None):
+    """황금지수 내림차순 순위 (동점은 입력 순서 유지), k 지정 시 힙으로 상위 k개만 O(n log k) 선택"""
+    if k is None:
+        return sorted(results, key=lambda x: x['golden_score'], reverse=True)
+    # nlargest도 동점이면 먼저 들어온 항목이 앞 (sorted(..., reverse=True)[:k]와 동일)
+    return heapq.nlargest(k, results, key=lambda x: x['golden_score'])
+
+
+def summarize_results(data, head_sizes=None):
+    """등급/블루오션 개수와 항목별 상위 키워드를 한 번의 순회로 집계 (정렬 불필요, 메모리는 상위 k개만)"""
+    head_sizes = SUMMARY_HEAD_SIZES if head_sizes is None else head_sizes
+    counts = dict.fromkeys(head_sizes, 0)
+    # 항목별 크기 제한 최소 힙: (황금지수, -입력순서, 항목), 동점이면 먼저 들어온 항목 우선
+    heaps = {name: [] for name in head_sizes}
+
+    total = 0
+    for index, item in enumerate(data):
+        total += 1
+        grade = item['grade']
+        if 'DIAMOND' in grade:
+            grade_bucket = 'diamond'
+        elif 'GOLD' in grade:
+            grade_bucket = 'gold'
+        elif 'SILVER' in grade:
+            grade_bucket = 'silver'
+        else:
+            grade_bucket = None
+
+        score = item['golden_score']
+        for name in ('top', grade_bucket, 'blueocean' if item['efficiency'] < 1.0 else None):
+            if name is None:
+                continue
+            counts[name] += 1
+            heap = heaps[name]
+            if len(heap) < head_sizes[name]:
+                heapq.heappush(heap, (score, -index, item))
+            elif score > heap[0][0]:
+                # 동점은 먼저 들어온 항목이 이미 힙에 있으므로 교체하지 않음
+                heapq.heapreplace(heap, (score, -index, item))
+
+    heads = {name: [entry[2] for entry in sorted(heap, key=lambda e: e[:2], reverse=True)]
+             for name, heap in heaps.items()}
+    return {'total': total, 'counts': counts, 'heads': heads}
+
+
+class RunMetrics:
+    """단계별 소요 시간, 제공자 지연시간 분포, 오류/대체 횟수 수집 (비활성 시 즉시 반환)"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.stages = {}
+        self.latencies = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name):
+        """단계 소요 시간 측정 컨텍스트"""
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._timed_stage(name)
+
+    @contextlib.contextmanager
+    def _timed_stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+
+    def observe(self, provider, started):
+        """제공자 호출 지연시간 기록 (started = perf_counter 시작값)"""
+        if not self.enabled:
+            return
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.latencies.setdefault(provider, []).append(elapsed)
+
+    def count(self, name, n=1):
+        """오류/대체 등 카운터 증가"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def to_dict(self):
+        """run_metrics.json 형식"""
+        providers = {}
+        for provider, values in self.latencies.items():
+            ordered = sorted(values)
+            n = len(ordered)
+
+            def percentile(p):
+                # 최근접 순위 (p50은 2개 중 작은 값, p100은 최댓값)
+                return round(ordered[max(0, math.ceil(p / 100 * n) - 1)] * 1000, 2)
+
+            buckets = {}
+            for limit in LATENCY_BUCKETS_MS:
+                buckets[f'le_{limit}ms'] = sum(1 for v in ordered if v * 1000 <= limit)
+            buckets['total'] = n
+
+            providers[provider] = {
+                'calls': n,
+                'p50_ms': percentile(50),
+                'p95_ms': percentile(95),
+                'p99_ms': percentile(99),
+                'max_ms': round(ordered[-1] * 1000, 2),
+                'histogram': buckets,
+            }
+
+        return {
+            'generated_at': datetime.now(KST).isoformat(),
+            'stages_s': {name: round(sec, 4) for name, sec in self.stages.items()},
+            'providers': providers,
+            'counters': dict(sorted(self.counters.items())),
+        }
+
+    def save(self, path):
+        """지표 파일 저장"""
+        with atomic_open(path) as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        print(f"✅ 실행 지표 저장: {path}")
+
+
+# 전역 실행 지표 (main()에서 활성화)
+METRICS = RunMetrics(enabled=RUN_METRICS)
+
+
+class RateLimiter:
+    """제공자별 토큰 버킷 (초당 rate개 충전, burst개까지 연속 허용, 스레드 안전)"""
+
+    def __init__(self, rate_per_sec, burst=1):
+        self.rate = rate_per_sec
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """토큰 1개 확보까지 대기 (부족하면 미리 차감해 대기 순서 보장)"""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait_for = -self._tokens / self.rate if self._tokens < 0 else 0
+        if wait_for > 0:
+            time.sleep(wait_for)
+
+
+class RequestScheduler:
+    """제공자 공통 요청 스케줄러 (제공자별 토큰 버킷, 자격 증명별 일일 한도 장부, 우선순위별 허용/이월)"""
+
+    def __init__(self, tail_reserve=None):
+        self.tail_reserve = QUOTA_TAIL_RESERVE if tail_reserve is None else tail_reserve
+        self.limits = {}
+        self.deferred = []
+        self._limiters = None
+        self._date = None
+        self._used = None
+        self._base = None
+        self._shard = None
+        self._lock = threading.Lock()
+
+    def limiters(self):
+        """실행 전체에서 공유하는 제공자별 토큰 버킷"""
+        with self._lock:
+            if self._limiters is None:
+                self._limiters = create_rate_limiters()
+            return self._limiters
+
+    def register(self, key, daily_quota):
+        """자격 증명 일일 한도 등록 (0이면 제한 없음)"""
+        with self._lock:
+            self.limits[key] = daily_quota
+            if self._shard is not None:
+                self._take_share(key)
+
+    def snapshot(self):
+        """오늘 날짜와 사용량 사본 (샤드 작업 프로세스에 전달)"""
+        with self._lock:
+            used = self._usage()
+            return self._date, dict(used)
+
+    def partition(self, shard, shards, date, used):
+        """샤드 작업 프로세스용 초기화: 부모의 사용량에서 시작해 남은 한도 중 shard번째 몫만 사용"""
+        with self._lock:
+            self._limiters = None
+            self.deferred = []
+            self._date, self._used = date, dict(used)
+            self._base = dict(used)
+            self._shard = (shard, shards)
+            for key in self.limits:
+                self._take_share(key)
+
+    def _take_share(self, key):
+        """남은 한도를 샤드 수로 나눠 나머지 몫은 이미 쓴 것으로 기록 (호출 측에서 잠금)"""
+        limit = self.limits.get(key, 0)
+        if not limit:
+            return
+        shard, shards = self._shard
+        used = self._base.get(key, 0)
+        remaining = max(0, limit - used)
+        share = remaining // shards + (1 if shard < remaining % shards else 0)
+        self._base[key] = self._used[key] = used + remaining - share
+
+    def usage_delta(self):
+        """샤드 작업 프로세스가 이번에 쓴 호출 수"""
+        with self._lock:
+            return {key: count - self._base.get(key, 0) for key, count in self._used.items()
+                    if count != self._base.get(key, 0)}
+
+    def absorb(self, limits, usage, deferred):
+        """샤드 작업 프로세스가 등록한 한도, 사용량, 이월 키워드를 장부에 반영"""
+        with self._lock:
+            for key, limit in limits.items():
+                self.limits.setdefault(key, limit)
+            used = self._usage()
+            for key, count in usage.items():
+                used[key] = used.get(key, 0) + count
+            self.deferred.extend(deferred)
+
+    def _usage(self):
+        """오늘(KST) 사용량 (날짜가 바뀌면 초기화, 호출 측에서 잠금)"""
+        today = datetime.now(KST).strftime('%Y-%m-%d')
+        if self._used is None:
+            saved = _read_json(QUOTA_PATH, {})
+            self._used = saved.get('used', {}) if saved.get('date') == today else {}
+        elif self._date != today:
+            self._used = {}
+        self._date = today
+        return self._used
+
+    def reserve(self, key):
+        """호출 1회 사용량 기록 (한도 초과 시 QuotaExceededError)"""
+        with self._lock:
+            used = self._usage()
+            limit = self.limits.get(key, 0)
+            if limit and used.get(key, 0) >= limit:
+                raise QuotaExceededError(f"{key} 일일 호출 한도 {limit}회 초과")
+            used[key] = used.get(key, 0) + 1
+
+    def admits(self, priority):
+        """우선순위별 허용 여부 (롱테일은 한도의 tail_reserve 비율을 남겨 둠)"""
+        with self._lock:
+            used = self._usage()
+            for key, limit in self.limits.items():
+                if not limit:
+                    continue
+                floor = limit * self.tail_reserve if priority >= PRIORITY_TAIL else 0
+                if limit - used.get(key, 0) <= floor:
+                    return False
+            return True
+
+    def defer(self, item, priority):
+        """다음 실행으로 넘길 키워드 기록"""
+        with self._lock:
+            self.deferred.append({
+                'keyword': item['keyword'],
+                'source': item['source'],
+                'sources': item.get('sources', [item['source']]),
+                'priority': priority,
+            })
+
+    def take_deferred(self):
+        """이전 실행에서 넘어온 키워드 (우선순위 순, 파일은 save 시 갱신)"""
+        carried = _read_json(DEFERRED_PATH, [])
+        return sorted(carried, key=lambda item: item.get('priority', PRIORITY_HEAD))
+
+    def summary(self):
+        """사용량/한도 요약 문자열"""
+        with self._lock:
+            used = self._usage()
+            parts = [f"{key} {used.get(key, 0)}/{limit or '∞'}" for key, limit in sorted(self.limits.items())]
+        return ', '.join(parts) or '등록된 자격 증명 없음'
+
+    def save(self):
+        """오늘 사용량과 이월 키워드 저장 (이월 없으면 파일 삭제)"""
+        with self._lock:
+            if self._used is not None:
+                _write_json(QUOTA_PATH, {'date': self._date, 'used': self._used})
+            deferred = list(self.deferred)
+        if deferred:
+            _write_json(DEFERRED_PATH, deferred)
+        elif DEFERRED_PATH.exists():
+            DEFERRED_PATH.unlink()
+
+
+SCHEDULER = RequestScheduler()
+
+
+class KeywordHistory:
+    """실행별 키워드 지표 이력 (SQLite, 정규화 키워드+시각 클러스터드 색인)"""
+
+    def __init__(self, path):
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS keyword_history ('
+            ' keyword_key TEXT NOT NULL, run_at TEXT NOT NULL, month TEXT NOT NULL,'
+            ' keyword TEXT NOT NULL, search_volume INTEGER, blog_count INTEGER,'
+            ' golden_score REAL, grade TEXT,'
+            ' PRIMARY KEY (keyword_key, run_at)) WITHOUT ROWID'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_keyword_history_month ON keyword_history (month, run_at)'
+        )
+        self._conn.commit()
+
+    def append(self, results, run_at=None):
+        """이번 실행 결과 추가 (추정값 지표는 NULL로 저장)"""
+        run_at = run_at or datetime.now(KST)
+        rows = []
+        for item in results:
+            estimated = item.get('estimated', [])
+            rows.append((
+                normalize_keyword(item['keyword']),
+                run_at.isoformat(timespec='seconds'),
+                run_at.strftime('%Y-%m'),
+                item['keyword'],
+                None if 'search_volume' in estimated else item['search_volume'],
+                None if 'blog_count' in estimated else item['blog_count'],
+                None if estimated else item['golden_score'],
+                None if estimated else item['grade'],
+            ))
+        self._conn.executemany('INSERT OR REPLACE INTO keyword_history VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        self._conn.commit()
+
+    def series(self, keyword, start=None, end=None):
+        """키워드 한 개의 기간별 이력 (start/end는 datetime)"""
+        query = 'SELECT run_at, search_volume, blog_count, golden_score, grade FROM keyword_history WHERE keyword_key = ?'
+        params = [normalize_keyword(keyword)]
+        if start is not None:
+            query += ' AND run_at >= ?'
+            params.append(start.isoformat(timespec='seconds'))
+        if end is not None:
+            query += ' AND run_at <= ?'
+            params.append(end.isoformat(timespec='seconds'))
+        return self._conn.execute(query + ' ORDER BY run_at', params).fetchall()
+
+    def baseline(self, keyword_keys, before):
+        """키워드별 기준 시각 이전 최신 지표 {키: (검색량, 황금지수)}"""
+        self._conn.execute('CREATE TEMP TABLE IF NOT EXISTS trend_keys (keyword_key TEXT PRIMARY KEY)')
+        self._conn.execute('DELETE FROM trend_keys')
+        self._conn.executemany('INSERT OR IGNORE INTO trend_keys VALUES (?)', ((k,) for k in keyword_keys))
+        rows = self._conn.execute(
+            # CROSS JOIN으로 키 목록을 바깥 루프로 고정 (키별 기본키 탐색 2회)
+            'SELECT h.keyword_key, h.search_volume, h.golden_score FROM trend_keys t'
+            ' CROSS JOIN keyword_history h'
+            ' WHERE h.keyword_key = t.keyword_key'
+            ' AND h.run_at = (SELECT MAX(run_at) FROM keyword_history'
+            '  WHERE keyword_key = t.keyword_key AND run_at <= ? AND golden_score IS NOT NULL)',
+            (before.isoformat(timespec='seconds'),)
+        ).fetchall()
+        return {key: (volume, score) for key, volume, score in rows}
+
+    def attach_trends(self, results, now=None, windows=None):
+        """결과에 기간별 검색량/황금지수 변화량 추가 (trend: {'7d': {...}})"""
+        now = now or datetime.now(KST)
+        windows = TREND_WINDOWS_DAYS if windows is None else windows
+        keys = [normalize_keyword(item['keyword']) for item in results]
+
+        for days in windows:
+            base = self.baseline(keys, now - timedelta(days=days))
+            for key, item in zip(keys, results):
+                if key not in base or item.get('estimated'):
+                    continue
+                volume, score = base[key]
+                if not item.get('trend'):
+                    item['trend'] = {}
+                item['trend'][f'{days}d'] = {
+                    'search_volume': item['search_volume'] - volume if volume is not None else None,
+                    'golden_score': round(item['golden_score'] - score, 1),
+                }
+
+    def close(self):
+        self._conn.close()
+
+
+def create_rate_limiters(limits=None, bursts=None):
+    """제공자별 RateLimiter(토큰 버킷) 생성"""
+    limits = PROVIDER_RATE_LIMITS if limits is None else limits
+    bursts = PROVIDER_BURSTS if bursts is None else bursts
+    return {name: RateLimiter(rate, bursts.get(name, 1)) for name, rate in limits.items()}
+
+
+class LookupCache:
+    """(제공자, 키워드) 단위 SQLite 조회 캐시 (지표별 TTL + LRU 크기 제한)"""
+
+    def __init__(self, path, ttl=None, max_entries=None, commit_every=None):
+        self.ttl = CACHE_TTL if ttl is None else ttl
+        self.max_entries = CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.commit_every = CACHE_COMMIT_EVERY if commit_every is None else commit_every
+        self.path = Path(path)
+        self.hits = {}
+        self.misses = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS lookup_cache ('
+            ' provider TEXT NOT NULL, keyword TEXT NOT NULL, value TEXT NOT NULL,'
+            ' fetched_at REAL NOT NULL, accessed_at REAL NOT NULL,'
+            ' PRIMARY KEY (provider, keyword))'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_lookup_cache_accessed ON lookup_cache (accessed_at)'
+        )
+        self._conn.commit()
+
+    def get(self, provider, keyword):
+        """TTL 이내 값이 있으면 반환, 없으면 None"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, fetched_at FROM lookup_cache WHERE provider = ? AND keyword = ?',
+                (provider, keyword)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl.get(provider, 0):
+                self.misses[provider] = self.misses.get(provider, 0) + 1
+                return None
+            self._touch(provider, keyword, now)
+            self.hits[provider] = self.hits.get(provider, 0) + 1
+        return json.loads(row[0])
+
+    def _touch(self, provider, keyword, now):
+        """LRU용 접근 시각 갱신 (호출 측에서 잠금)"""
+        self._conn.execute(
+            'UPDATE lookup_cache SET accessed_at = ? WHERE provider = ? AND keyword = ?',
+            (now, provider, keyword)
+        )
+
+    def set(self, provider, keyword, value):
+        """조회 결과 저장"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO lookup_cache VALUES (?, ?, ?, ?, ?)',
+                (provider, keyword, json.dumps(value, ensure_ascii=False), now, now)
+            )
+            self._pending += 1
+            if self._pending >= max(1, self.commit_every):
+                self._conn.commit()
+                self._pending = 0
+
+    def absorb(self, delta):
+        """ShardLookupCache.delta() 반영 (적중/미스 집계, 접근 시각, 새 값)"""
+        with self._lock:
+            for name, counts in (('hits', self.hits), ('misses', self.misses)):
+                for provider, count in delta[name].items():
+                    counts[provider] = counts.get(provider, 0) + count
+            self._conn.executemany(
+                'UPDATE lookup_cache SET accessed_at = ? WHERE provider = ? AND keyword = ?',
+                [(now, provider, keyword) for provider, keyword, now in delta['accessed']]
+            )
+            self._conn.executemany('INSERT OR REPLACE INTO lookup_cache VALUES (?, ?, ?, ?, ?)',
+                                   delta['written'])
+            self._conn.commit()
+            self._pending = 0
+
+    def prune(self):
+        """최근 사용 순으로 max_entries 개만 남기고 삭제"""
+        with self._lock:
+            self._conn.execute(
+                'DELETE FROM lookup_cache WHERE rowid NOT IN ('
+                ' SELECT rowid FROM lookup_cache ORDER BY accessed_at DESC LIMIT ?)',
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def close(self):
+        """정리 후 연결 종료"""
+        self.prune()
+        self._conn.close()
+
+    def summary(self):
+        """제공자별 적중/미스 요약 문자열"""
+        providers = sorted(set(self.hits) | set(self.misses))
+        return ', '.join(
+            f"{p} 적중 {self.hits.get(p, 0)}/미스 {self.misses.get(p, 0)}" for p in providers
+        ) or '조회 없음'
+
+
+class ShardLookupCache(LookupCache):
+    """샤드 작업 프로세스용 조회 캐시 (공유 DB는 읽기 전용, 새 값/접근 시각은 모아서 부모가 absorb로 반영)
+
+    여러 프로세스가 같은 SQLite 파일에 쓰기 트랜잭션을 열면 잠금 대기로 실패하므로 쓰기는 부모 한 곳에서만"""
+
+    def __init__(self, path, ttl=None, max_entries=None):
+        self.ttl = CACHE_TTL if ttl is None else ttl
+        self.max_entries = CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.path = Path(path)
+        self.hits = {}
+        self.misses = {}
+        self.accessed = []
+        self.written = []
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path.resolve().as_uri() + '?mode=ro', uri=True,
+                                     check_same_thread=False)
+
+    def _touch(self, provider, keyword, now):
+        self.accessed.append((provider, keyword, now))
+
+    def set(self, provider, keyword, value):
+        """조회 결과 기록 (부모 프로세스가 저장)"""
+        now = time.time()
+        with self._lock:
+            self.written.append((provider, keyword, json.dumps(value, ensure_ascii=False), now, now))
+
+    def close(self):
+        self._conn.close()
+
+    def delta(self):
+        """부모 프로세스로 돌려보낼 변경분"""
+        return {'hits': self.hits, 'misses': self.misses, 'accessed': self.accessed, 'written': self.written}
+
+
+def prefetch_search_volumes(keywords, limiters, cache=None, stats=None, related=None):
+    """검색광고 API 대량 조회(요청당 5개)로 검색량 미리 확보, {키워드: 검색량 또는 None}
+
+    related(dict)를 넘기면 같은 응답의 연관 키워드도 채워 캐시에 저장 (연관 키워드 단건 조회 생략)
+    stats를 넘기면 조회 수/요청 수를 누적만 하고 출력은 호출 측에 맡김"""
+    client = get_naver_searchad_client()
+    if client is None or PROVIDERS['search_volume'][0] is not fetch_search_volume:
+        return {}
+
+    volumes = {}
+    pending = []
+    for item in keywords:
+        keyword = item['keyword']
+        value = cache.get('search_volume', keyword) if cache is not None else None
+        if value is not None:
+            volumes[keyword] = value
+        else:
+            pending.append(keyword)
+
+    if related is not None and PROVIDERS['related_keywords'][0] is not fetch_related_keywords:
+        related = None
+
+    if pending:
+        found = {} if related is not None else None
+        fetched = client.search_volumes(pending, limiter=limiters['search_volume'], related=found)
+        for keyword, value in fetched.items():
+            volumes[keyword] = value
+            if value is not None and cache is not None:
+                cache.set('search_volume', keyword, value)
+        for keyword, value in (found or {}).items():
+            related[keyword] = value
+            if cache is not None:
+                cache.set('related_keywords', keyword, value)
+        requests_made = -(-len(pending) // SEARCHAD_HINT_BATCH)
+        if stats is None:
+            print(f"   - 검색량 대량 조회: {len(pending)}개 → 요청 {requests_made}회")
+        else:
+            stats['keywords'] = stats.get('keywords', 0) + len(pending)
+            stats['requests'] = stats.get('requests', 0) + requests_made
+
+    return volumes
+
+
+# 기본 조회 함수별 HTTP 클라이언트 (클라이언트가 없으면 실제 호출이 없으므로 속도 제한 생략)
+PROVIDER_CLIENTS = {
+    'search_volume': (fetch_search_volume, get_naver_searchad_client),
+    'blog_count': (fetch_blog_count, get_naver_openapi_client),
+    'related_keywords': (fetch_related_keywords, get_naver_searchad_client),
+}
+
+
+def needs_rate_limit(provider, fetch):
+    """이번 조회가 실제 외부 호출인지 (교체된 조회 함수는 외부 호출로 간주)"""
+    default, get_client = PROVIDER_CLIENTS.get(provider, (None, None))
+    if fetch is not default:
+        return True
+    return get_client() is not None
+
+
+def cached_lookup(provider, keyword, limiters, cache=None, prefetched=None):
+    """캐시 확인 후 미스일 때만 속도 제한을 거쳐 조회, (값, 추정 여부) 반환"""
+    batch = (prefetched or {}).get(provider)
+    if batch is not None and keyword in batch:
+        if batch[keyword] is not None:
+            return batch[keyword], False
+        # 대량 조회에 결과가 없으면 단건 재조회 없이 추정값 사용
+        METRICS.count(f'{provider}.fallback')
+        return PROVIDERS[provider][1](keyword), True
+
+    if cache is not None:
+        value = cache.get(provider, keyword)
+        if value is not None:
+            return value, False
+
+    fetch, estimate = PROVIDERS[provider]
+    if OFFLINE_MODE:
+        # 오프라인 모드: 제공자 클라이언트가 없으므로 속도 제한 없이 바로 추정값
+        if estimate is not None:
+            return estimate(keyword), True
+        return fetch(keyword), False
+    if needs_rate_limit(provider, fetch):
+        limiters[provider].wait()
+    started = time.perf_counter()
+    try:
+        value = fetch(keyword)
+    except ProviderError as e:
+        METRICS.observe(provider, started)
+        METRICS.count(f'{provider}.{type(e).__name__}')
+        # 한도 초과는 추정값 대신 호출 측에서 다음 실행으로 이월
+        if estimate is None or isinstance(e, QuotaExceededError):
+            raise
+        # 추정값은 캐시에 저장하지 않음
+        METRICS.count(f'{provider}.fallback')
+        return estimate(keyword), True
+    METRICS.observe(provider, started)
+
+    if cache is not None:
+        cache.set(provider, keyword, value)
+    return value, False
+
+
+class RunJournal:
+    """조회 완료된 키워드 레코드의 추가 전용 저널 (JSON Lines, N개마다 fsync)"""
+
+    def __init__(self, path, resume=False, fsync_every=None):
+        self.path = Path(path)
+        self.fsync_every = JOURNAL_FSYNC_EVERY if fsync_every is None else fsync_every
+        self.completed = self._load() if resume else {}
+        if not resume:
+            # 새 실행이면 이전 샤드 저널도 무효
+            for path in self._shard_paths():
+                path.unlink()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8')
+
+    def shard_path(self, shard):
+        """샤드 작업 프로세스가 쓰는 저널 경로 (checkpoint.jsonl.N)"""
+        return self.path.with_name(f'{self.path.name}.{shard}')
+
+    def _shard_paths(self):
+        return sorted(path for path in self.path.parent.glob(f'{self.path.name}.*')
+                      if path.suffix[1:].isdigit())
+
+    def _load(self):
+        """저널 읽기 (샤드 저널 포함, 중단으로 잘린 마지막 줄, 오래된 기록은 무시)"""
+        completed = {}
+        oldest = datetime.now(KST) - timedelta(hours=JOURNAL_MAX_AGE_HOURS)
+        for path in [self.path] + self._shard_paths():
+            if not path.exists():
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if datetime.fromisoformat(record['fetched_at']) < oldest:
+                        continue
+                    completed[normalize_keyword(record['keyword'])] = record
+        return completed
+
+    def lookup(self, item):
+        """이전 실행에서 완료된 레코드 (출처는 이번 입력 기준, 없으면 None)"""
+        record = self.completed.get(normalize_keyword(item['keyword']))
+        if record is None:
+            return None
+        return dict(record, source=item['source'], sources=item.get('sources', [item['source']]))
+
+    def append(self, record):
+        """레코드 추가 (추정값이 섞인 레코드는 재개 시 다시 조회하도록 제외)"""
+        if record['estimated']:
+            return
+        line = json.dumps(record, ensure_ascii=False, default=json_default) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._pending += 1
+            if self._pending >= self.fsync_every:
+                self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def close(self):
+        """남은 레코드 동기화 후 닫기 (저널 파일은 유지)"""
+        with self._lock:
+            if not self._file.closed:
+                self._sync()
+                self._file.close()
+
+    def discard(self):
+        """실행 완료 후 저널 삭제 (샤드 저널 포함)"""
+        self.close()
+        if self.path.exists():
+            self.path.unlink()
+        for path in self._shard_paths():
+            path.unlink()
+
+
+def enrich_keyword(item, limiters, cache=None, prefetched=None):
+    """단일 키워드 데이터 수집 (점수 계산은 score_records에서 일괄 처리)"""
+    keyword = item['keyword']
+    source = item['source']
+
+    # 데이터 수집 (실패 시 추정값 사용, 추정 항목은 결과에 표시)
+    search_volume, volume_estimated = cached_lookup('search_volume', keyword, limiters, cache, prefetched)
+    blog_count, blog_estimated = cached_lookup('blog_count', keyword, limiters, cache)
+    estimated = [name for name, flag in (('search_volume', volume_estimated),
+                                         ('blog_count', blog_estimated)) if flag]
+
+    # 쿠팡 키워드도 네이버 연관검색어 수집
+    related, _ = cached_lookup('related_keywords', keyword, limiters, cache, prefetched)
+
+    return {
+        'keyword': keyword,
+        'source': source,
+        'sources': item.get('sources', [source]),
+        'search_volume': search_volume,
+        'blog_count': blog_count,
+        'related_keywords': related,
+        'estimated': estimated,
+        'fetched_at': datetime.now(KST).isoformat(timespec='seconds')
+    }
+
+
+def analyze_keywords(keywords, workers=None, rate_limits=None, cache=None, history=None, top_k=None,
+                     journal=None, priority=PRIORITY_HEAD):
+    """키워드 분석 실행 (키워드 단위 병렬 조회, 입력 순서 유지, 이력 있으면 추세 추가)
+
+    일일 한도로 조회할 수 없는 키워드는 결과에서 빼고 SCHEDULER를 통해 다음 실행으로 이월"""
+    workers = ENRICH_WORKERS if workers is None else workers
+    limiters = SCHEDULER.limiters() if rate_limits is None else create_rate_limiters(rate_limits)
+
+    def enrich(item, resumed, prefetched):
+        if resumed is not None:
+            return resumed
+        item_priority = item.get('priority', priority)
+        if not SCHEDULER.admits(item_priority):
+            SCHEDULER.defer(item, item_priority)
+            return None
+        try:
+            record = enrich_keyword(item, limiters, cache, prefetched)
+        except QuotaExceededError:
+            SCHEDULER.defer(item, item_priority)
+            return None
+        if journal is not None:
+            journal.append(record)
+        return record
+
+    # 입력을 묶음 단위로 받아 바로 조회 시작 (수집 생성기와 겹쳐 진행, 결과는 입력 순서 유지)
+    resumed_count = 0
+    prefetch_stats = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = []
+        for chunk in iter_chunks(keywords, ANALYZE_CHUNK_SIZE):
+            # 저널에 완료 기록이 있는 키워드는 조회 생략
+            resumed = [journal.lookup(item) if journal is not None else None for item in chunk]
+            resumed_count += len(resumed) - resumed.count(None)
+
+            # 검색량은 키워드 도구 API로 묶어서 먼저 조회 (키워드마다 자기 우선순위로 한도 여유 확인)
+            prefetched = {}
+            pending = [item for item, record in zip(chunk, resumed)
+                       if record is None and SCHEDULER.admits(item.get('priority', priority))]
+            if pending:
+                prefetched['related_keywords'] = {}
+                prefetched['search_volume'] = prefetch_search_volumes(pending, limiters, cache, prefetch_stats,
+                                                                      related=prefetched['related_keywords'])
+
+            futures.extend(executor.submit(enrich, item, record, prefetched)
+                           for item, record in zip(chunk, resumed))
+        records = [future.result() for future in futures]
+
+    if prefetch_stats:
+        print(f"   - 검색량 대량 조회: {prefetch_stats['keywords']}개 → 요청 {prefetch_stats['requests']}회")
+    if resumed_count:
+        METRICS.count('journal.resumed', resumed_count)
+        print(f"   - 저널에서 재개: {resumed_count}개 조회 생략")
+
+    deferred = records.count(None)
+    if deferred:
+        METRICS.count('scheduler.deferred', deferred)
+        print(f"   - ⏳ 일일 한도로 다음 실행에 이월: {deferred}개")
+        records = [record for record in records if record is not None]
+
+    # 경쟁강도/황금지수/등급 일괄 계산
+    results = score_records(records)
+
+    # 이전 실행 대비 변화량
+    if history is not None:
+        history.attach_trends(results)
+
+    # 황금지수 순위 (전체 테이블이 필요 없으면 top_k로 상위만 선택)
+    return rank_results(results, top_k)
+
+
+def keyword_shard(keyword, shards):
+    """정규화 키워드 해시로 샤드 번호 결정 (실행/프로세스와 무관하게 고정)"""
+    return zlib.crc32(normalize_keyword(keyword).encode('utf-8')) % shards
+
+
+def _analyze_shard(task):
+    """샤드 작업 프로세스: 자기 몫의 키워드를 분석/채점해 (입력 순번, 레코드) 순위 목록과 부모에 반영할 변경분 반환"""
+    global PROVIDER_BURSTS, OFFLINE_MODE
+    shard, shards, indexed, resumed, options = task
+
+    # 부모에서 fork로 물려받은 상태 정리: 클라이언트 세션은 공유하지 않고, 속도/한도는 샤드 몫만 사용
+    OFFLINE_MODE = options['offline']
+    _clients.clear()
+    PROVIDER_BURSTS = {name: max(1, burst // shards) for name, burst in PROVIDER_BURSTS.items()}
+    rate_limits = {name: rate / shards for name, rate in options['rate_limits'].items()}
+    SCHEDULER.partition(shard, shards, *options['usage'])
+
+    cache = ShardLookupCache(options['cache_path']) if options['cache_path'] else None
+    journal = None
+    if options['journal_path']:
+        journal = RunJournal(options['journal_path'], resume=True)
+        journal.completed.update(resumed)
+    try:
+        ranked = analyze_keywords([item for _, item in indexed], workers=options['workers'],
+                                  rate_limits=rate_limits, cache=cache, top_k=options['top_k'],
+                                  journal=journal, priority=options['priority'])
+    finally:
+        if journal is not None:
+            journal.close()
+        if cache is not None:
+            cache.close()
+
+    # 입력은 중복 제거된 상태라 키워드로 입력 순번을 찾음 (샤드 안의 동점은 이미 입력 순서)
+    positions = {}
+    for index, item in indexed:
+        positions.setdefault(item['keyword'], []).append(index)
+    ranked = [(positions[record['keyword']].pop(0), record) for record in ranked]
+
+    return (ranked, cache.delta() if cache is not None else None,
+            (SCHEDULER.limits, SCHEDULER.usage_delta(), SCHEDULER.deferred))
+
+
+def analyze_keywords_sharded(keywords, shards=None, workers=None, rate_limits=None, cache=None, history=None,
+                             top_k=None, journal=None, priority=PRIORITY_HEAD):
+    """샤드 모드 키워드 분석: 해시로 나눈 키워드를 프로세스별로 분석/채점한 뒤 정렬된 결과를 k-way 병합
+
+    결과는 (-황금지수, 입력 순번) 순이라 단일 프로세스 analyze_keywords와 같고 샤드 수와 무관.
+    속도 제한/남은 일일 한도는 샤드 수로 나눠 쓰고, 캐시 쓰기/사용량/이월은 부모가 모아서 반영"""
+    shards = ANALYZE_SHARDS if shards is None else shards
+    if shards <= 1:
+        return analyze_keywords(keywords, workers=workers, rate_limits=rate_limits, cache=cache,
+                                history=history, top_k=top_k, journal=journal, priority=priority)
+
+    # 프로세스 풀(multiprocessing)은 샤드 모드에서만 로드
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    # 교체된 PROVIDERS/클라이언트 설정 등 부모 상태를 그대로 물려받아야 하므로 fork만 사용
+    # (spawn/forkserver는 모듈을 새로 import해 상태가 조용히 사라짐)
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        print("   - ⚠️ fork를 지원하지 않는 플랫폼이라 샤드 없이 분석")
+        return analyze_keywords(keywords, workers=workers, rate_limits=rate_limits, cache=cache,
+                                history=history, top_k=top_k, journal=journal, priority=priority)
+
+    # 입력 순번을 붙여 샤드별로 분배 (저널 완료분도 해당 샤드로 전달)
+    parts = [[] for _ in range(shards)]
+    resumed = [{} for _ in range(shards)]
+    for index, item in enumerate(keywords):
+        shard = keyword_shard(item['keyword'], shards)
+        parts[shard].append((index, item))
+        if journal is not None:
+            key = normalize_keyword(item['keyword'])
+            if key in journal.completed:
+                resumed[shard][key] = journal.completed[key]
+
+    options = {
+        'workers': workers,
+        'rate_limits': PROVIDER_RATE_LIMITS if rate_limits is None else rate_limits,
+        'cache_path': str(cache.path) if cache is not None else None,
+        'top_k': top_k,
+        'priority': priority,
+        'usage': SCHEDULER.snapshot(),
+        'offline': OFFLINE_MODE,
+    }
+    if cache is not None:
+        # 작업 프로세스가 읽기 전용으로 여는 동안 부모의 미완료 쓰기가 없도록
+        cache.prune()
+    tasks = [(shard, shards, part, resumed[shard],
+              dict(options, journal_path=str(journal.shard_path(shard)) if journal is not None else None))
+             for shard, part in enumerate(parts) if part]
+
+    # fork로 물려받은 부모 객체는 GC 대상에서 빼서 자식의 전체 수집/페이지 복사 방지
+    gc.freeze()
+    try:
+        with ProcessPoolExecutor(max_workers=len(tasks) or 1,
+                                 mp_context=multiprocessing.get_context('fork')) as executor:
+            outputs = list(executor.map(_analyze_shard, tasks))
+    finally:
+        gc.unfreeze()
+
+    ranked_parts = []
+    for ranked, cache_delta, scheduler_state in outputs:
+        ranked_parts.append(ranked)
+        if cache is not None:
+            cache.absorb(cache_delta)
+        SCHEDULER.absorb(*scheduler_state)
+
+    # 샤드별 결과는 이미 (-황금지수, 입력 순번) 순이므로 k-way 병합만
+    merged = heapq.merge(*ranked_parts, key=lambda pair: (-pair[1]['golden_score'], pair[0]))
+    results = [record for _, record in itertools.islice(merged, top_k)]
+
+    if history is not None:
+        history.attach_trends(results)
+    return results
+
+
+class BloomFilter:
+    """방문 집합용 블룸 필터 (대규모 확장 시 메모리 절약, 거짓 양성만 허용)"""
+
+    def __init__(self, capacity, error_rate=0.001, bits=None, hashes=None):
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = hashes or max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bits if bits is not None else bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def to_dict(self):
+        return {'size': self.size, 'hashes': self.hashes,
+                'bits': base64.b64encode(bytes(self.bits)).decode('ascii')}
+
+    @classmethod
+    def from_dict(cls, data):
+        bloom = cls(1, bits=bytearray(base64.b64decode(data['bits'])), hashes=data['hashes'])
+        bloom.size = data['size']
+        return bloom
+
+
+def make_visited_set(expected):
+    """예상 방문 수에 따라 set 또는 BloomFilter"""
+    return BloomFilter(expected) if expected >= BLOOM_THRESHOLD else set()
+
+
+def expansion_seed_digest(results):
+    """확장 시작 키워드 집합의 지문 (체크포인트가 같은 입력에서 나온 것인지 확인)"""
+    keys = sorted(normalize_keyword(item['keyword']) for item in results)
+    return hashlib.sha256('\n'.join(keys).encode('utf-8')).hexdigest()[:16]
+
+
+def _save_expansion_checkpoint(path, state):
+    """확장 진행 상태 저장 (임시 파일 후 교체, 저장 시각 포함)"""
+    visited = state['visited']
+    payload = dict(state, saved_at=datetime.now(KST).isoformat(), visited=(
+        {'bloom': visited.to_dict()} if isinstance(visited, BloomFilter) else {'set': sorted(visited)}
+    ))
+    with atomic_open(path) as f:
+        json.dump(payload, f, ensure_ascii=False, default=json_default)
+
+
+def _load_expansion_checkpoint(path, seeds=None, max_age_hours=None):
+    """확장 진행 상태 복원 (없거나, 오래됐거나, 시작 키워드가 다르면 None)"""
+    max_age_hours = EXPANSION_CHECKPOINT_MAX_AGE_HOURS if max_age_hours is None else max_age_hours
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+    saved_at = state.get('saved_at')
+    if not saved_at or datetime.now(KST) - datetime.fromisoformat(saved_at) > timedelta(hours=max_age_hours):
+        print("   - 확장 체크포인트가 오래되어 무시")
+        return None
+    if seeds is not None and state.get('seeds') != seeds:
+        print("   - 확장 체크포인트의 시작 키워드가 달라 무시")
+        return None
+    visited = state['visited']
+    state['visited'] = BloomFilter.from_dict(visited['bloom']) if 'bloom' in visited else set(visited['set'])
+    state['frontier'] = [tuple(entry) for entry in state['frontier']]
+    state['discovered'] = [KeywordRecord.from_dict(item) for item in state['discovered']]
+    return state
+
+
+def expand_keywords(results, max_depth=None, budget=None, batch_size=None,
+                    cache=None, history=None, checkpoint_path=None, resume=True):
+    """연관 키워드 확장: 황금지수 높은 키워드부터 연관어를 분석해 결과에 추가"""
+    max_depth = EXPANSION_MAX_DEPTH if max_depth is None else max_depth
+    budget = EXPANSION_BUDGET if budget is None else budget
+    # 배치가 0 이하면 큐에서 아무것도 꺼내지 않아 무한 반복하므로 최소 1
+    batch_size = max(1, EXPANSION_BATCH if batch_size is None else batch_size)
+
+    seeds = expansion_seed_digest(results)
+    state = _load_expansion_checkpoint(checkpoint_path, seeds) if checkpoint_path and resume else None
+    if state is None:
+        visited = make_visited_set(len(results) + budget)
+        for item in results:
+            visited.add(normalize_keyword(item['keyword']))
+        # 우선순위 큐 항목: (-황금지수, 깊이, 순번, 키워드, 연관 키워드)
+        frontier = [(-item['golden_score'], 0, seq, item['keyword'], item['related_keywords'])
+                    for seq, item in enumerate(results)]
+        heapq.heapify(frontier)
+        state = {'visited': visited, 'frontier': frontier, 'discovered': [],
+                 'seq': len(results), 'used': 0, 'seeds': seeds}
+    else:
+        print(f"   - 확장 체크포인트 재개: {len(state['discovered'])}개 발견, 예산 {state['used']}/{budget} 사용")
+
+    visited = state['visited']
+    frontier = state['frontier']
+
+    while frontier and state['used'] < budget:
+        # 롱테일 확장은 일일 한도 여유가 있을 때만 (수집 키워드 몫을 남겨 둠)
+        if not SCHEDULER.admits(PRIORITY_TAIL):
+            print("   - ⏳ 일일 한도 여유 부족: 확장 중단")
+            break
+
+        # 우선순위 높은 노드부터 새 연관 키워드를 배치 크기(남은 예산 이내)만큼 모음
+        limit = min(batch_size, budget - state['used'])
+        candidates = []
+        while frontier and len(candidates) < limit:
+            score, depth, seq, keyword, related = heapq.heappop(frontier)
+            if depth >= max_depth:
+                continue
+            for i, child in enumerate(related):
+                if len(candidates) >= limit:
+                    # 배치가 찼으면 방문 표시 전에 멈추고 남은 연관어는 노드째 큐에 되돌림
+                    heapq.heappush(frontier, (score, depth, seq, keyword, related[i:]))
+                    break
+                key = normalize_keyword(child)
+                if key in visited:
+                    continue
+                visited.add(key)
+                candidates.append(({'keyword': child, 'source': 'NAVER'}, depth + 1))
+
+        if not candidates:
+            continue
+
+        depth_of = {c['keyword']: depth for c, depth in candidates}
+        analyzed = analyze_keywords([c for c, _ in candidates], cache=cache, history=history,
+                                    priority=PRIORITY_TAIL)
+        state['used'] += len(candidates)
+
+        for item in analyzed:
+            state['discovered'].append(item)
+            heapq.heappush(frontier, (-item['golden_score'], depth_of[item['keyword']],
+                                      state['seq'], item['keyword'], item['related_keywords']))
+            state['seq'] += 1
+
+        if checkpoint_path:
+            _save_expansion_checkpoint(checkpoint_path, state)
+
+    if checkpoint_path and checkpoint_path.exists():
+        checkpoint_path.unlink()
+
+    METRICS.count('expansion.discovered', len(state['discovered']))
+    return rank_results(results + state['discovered'])
+
+
+def load_previous_results():
+    """이전 실행의 data.json 키워드 결과 (없으면 None)"""
+    path = OUTPUT_DIR / 'data.json'
+    if not path.exists():
+        return None
+    return _read_json(path, {}).get('keywords')
+
+
+def is_reusable(previous, now, max_age_hours=None, volatility=None):
+    """이전 결과를 그대로 재사용해도 되는지 (실측값, 신선도, 변동성 기준)"""
+    max_age_hours = INCREMENTAL_MAX_AGE_HOURS if max_age_hours is None else max_age_hours
+    volatility = INCREMENTAL_VOLATILITY if volatility is None else volatility
+
+    if previous.get('estimated') or not previous.get('fetched_at'):
+        return False
+    if now - datetime.fromisoformat(previous['fetched_at']) > timedelta(hours=max_age_hours):
+        return False
+
+    # 최근 검색량 변동이 큰 키워드는 다시 조회
+    delta = (previous.get('trend') or {}).get('1d', {}).get('search_volume')
+    if delta is not None and previous['search_volume'] > 0:
+        if abs(delta) / previous['search_volume'] > volatility:
+            return False
+    return True
+
+
+def analyze_keywords_incremental(keywords, previous, cache=None, history=None, **kwargs):
+    """변경된 입력만 다시 분석, (전체 결과, 새로 분석한 결과) 반환"""
+    now = datetime.now(KST)
+    previous_by_key = {normalize_keyword(item['keyword']): item for item in previous or []}
 
+    reused = []
+    refetch = []
+    for item in keywords:
+        prev = previous_by_key.get(normalize_keyword(item['keyword']))
+        if prev is not None and is_reusable(prev, now):
+            reused.append(KeywordRecord.from_dict(prev, source=item['source'],
+                                                  sources=item.get('sources', [item['source']])))
+        else:
+            refetch.append(item)
 
-def get_search_volume(keyword):
-    """네이버 광고 API로 검색량 조회"""
-    # 실제 구현 시 네이버 광고 API 연동
-    # 여기서는 랜덤 샘플 데이터 반환
-    import random
-    return random.randint(10000, 500000)
+    refreshed = analyze_keywords_sharded(refetch, cache=cache, history=history, **kwargs) if refetch else []
+    if history is not None and reused:
+        history.attach_trends(reused)
 
+    METRICS.count('incremental.reused', len(reused))
+    METRICS.count('incremental.refetched', len(refetch))
+    print(f"   - 증분 분석: 재사용 {len(reused)}개, 재조회 {len(refetch)}개")
 
-def get_blog_count(keyword):
-    """네이버 블로그 검색 결과 수 조회"""
-    if not NAVER_CLIENT_ID or not NAVER_CLIENT_SECRET:
-        import random
-        return random.randint(5000, 100000)
-    
-    try:
-        url = "https://openapi.naver.com/v1/search/blog.json"
-        headers = {
-            "X-Naver-Client-Id": NAVER_CLIENT_ID,
-            "X-Naver-Client-Secret": NAVER_CLIENT_SECRET
-        }
-        params = {"query": keyword, "display": 1}
-        
-        response = requests.get(url, headers=headers, params=params, timeout=5)
-        if response.status_code == 200:
-            return response.json().get('total', 0)
-    except Exception as e:
-        print(f"블로그 검색 오류: {e}")
-    
-    import random
-    return random.randint(5000, 100000)
+    return rank_results(reused + refreshed), refreshed
 
 
-def get_related_keywords(keyword):
-    """네이버 연관 검색어 수집"""
-    # 실제 구현 시 네이버 연관검색어 API 또는 크롤링
-    return []
+def _comparable(value):
+    """튜플/리스트 차이를 무시하고 비교"""
+    return list(value) if isinstance(value, tuple) else value
 
 
-def calculate_golden_score(search_volume, blog_count):
-    """황금지수 계산"""
-    if blog_count == 0:
-        return 100.0
-    
-    efficiency = blog_count / search_volume if search_volume > 0 else 999
-    
-    # 황금지수 공식: 검색량이 높고 경쟁이 낮을수록 높은 점수
-    if efficiency < 0.1:
-        base_score = 90
-    elif efficiency < 0.5:
-        base_score = 70
-    elif efficiency < 1.0:
-        base_score = 50
-    elif efficiency < 3.0:
-        base_score = 30
-    else:
-        base_score = 10
-    
-    # 검색량 보너스
-    if search_volume > 100000:
-        base_score += 10
-    elif search_volume > 50000:
-        base_score += 5
-    
-    return min(100, base_score)
+def diff_results(previous, current):
+    """이전/현재 결과 비교 (추가, 삭제, 등급 변경, 값 변경 키워드)"""
+    compared = ('source', 'sources', 'search_volume', 'blog_count', 'golden_score', 'grade')
+    previous_by_key = {normalize_keyword(item['keyword']): item for item in previous or []}
+    current_keys = set()
+    diff = {'added': [], 'removed': [], 'grade_changed': [], 'changed': []}
 
+    for item in current:
+        key = normalize_keyword(item['keyword'])
+        current_keys.add(key)
+        prev = previous_by_key.get(key)
+        if prev is None:
+            diff['added'].append(item['keyword'])
+            continue
+        if prev.get('grade') != item['grade']:
+            diff['grade_changed'].append({'keyword': item['keyword'], 'from': prev.get('grade'),
+                                          'to': item['grade']})
+        if any(_comparable(prev.get(field)) != _comparable(item.get(field)) for field in compared):
+            diff['changed'].append(item['keyword'])
 
-def get_grade(score):
-    """황금지수에 따른 등급 산정"""
-    if score >= 80:
-        return '💎 DIAMOND'
-    elif score >= 60:
-        return '🌟 GOLD'
-    elif score >= 40:
-        return '✨ SILVER'
-    else:
-        return 'Bad'
+    diff['removed'] = [item['keyword'] for key, item in previous_by_key.items()
+                       if key not in current_keys]
 
+    # 순위가 바뀌면 목록 재생성이 필요
+    diff['order_changed'] = [normalize_keyword(i['keyword']) for i in previous or []] != \
+        [normalize_keyword(i['keyword']) for i in current]
+    return diff
 
-def analyze_keywords(keywords):
-    """키워드 분석 실행"""
-    results = []
-    
-    for item in keywords:
-        keyword = item['keyword']
-        source = item['source']
-        
-        # 데이터 수집
-        search_volume = get_search_volume(keyword)
-        blog_count = get_blog_count(keyword)
-        
-        # 경쟁강도 (효율성) 계산
-        efficiency = round(blog_count / search_volume, 2) if search_volume > 0 else 999.99
-        
-        # 황금지수 계산
-        golden_score = calculate_golden_score(search_volume, blog_count)
-        grade = get_grade(golden_score)
-        
-        # 쿠팡 키워드도 네이버 연관검색어 수집
-        related = get_related_keywords(keyword)
-        
-        results.append({
-            'keyword': keyword,
-            'source': source,
-            'search_volume': search_volume,
-            'blog_count': blog_count,
-            'efficiency': efficiency,
-            'golden_score': round(golden_score, 1),
-            'grade': grade,
-            'related_keywords': related
-        })
-    
-    # 황금지수 기준 정렬
-    results.sort(key=lambda x: x['golden_score'], reverse=True)
-    
-    return results
+
+def has_changes(diff):
+    """diff에 출력물을 다시 만들어야 할 변경이 있는지"""
+    return bool(diff['added'] or diff['removed'] or diff['changed'] or diff['order_changed'])
 
 
-def generate_seo_summary(data, date_str):
+def generate_seo_summary(data, date_str, summary=None):
     """SEO 친화적 문장형 요약 생성"""
     if not data:
         return f"{date_str} 기준 분석된 키워드가 없습니다."
     
-    total = len(data)
-    diamond_count = len([i for i in data if 'DIAMOND' in i.get('grade', '')])
-    blueocean_count = len([i for i in data if i.get('efficiency', 999) < 1.0])
+    summary = summary or summarize_results(data)
+    total = summary['total']
+    diamond_count = summary['counts']['diamond']
+    blueocean_count = summary['counts']['blueocean']
     
-    top_keyword = data[0]
+    top_keyword = summary['heads']['top'][0]
     
     summary = (
         f"{date_str} 기준, 네이버와 쿠팡의 실시간 트렌드를 분석한 결과 "
@@ -217,32 +2094,32 @@ def generate_seo_summary(data, date_str):
     return summary
 
 
-def generate_keyword_review(data):
+def generate_keyword_review(data, summary=None):
     """키워드 총평 생성"""
     if not data:
         return "분석된 키워드가 없습니다."
     
-    diamond_list = [i['keyword'] for i in data if 'DIAMOND' in i.get('grade', '')]
-    gold_list = [i['keyword'] for i in data if 'GOLD' in i.get('grade', '')]
-    blueocean_list = [i['keyword'] for i in data if i.get('efficiency', 999) < 1.0]
+    summary = summary or summarize_results(data)
+    counts = summary['counts']
+    heads = {name: [item['keyword'] for item in items] for name, items in summary['heads'].items()}
     
     review_parts = []
     
-    if diamond_list:
+    if counts['diamond']:
         review_parts.append(
-            f"💎 다이아몬드 등급 키워드: {', '.join(diamond_list[:3])} "
-            f"{'외 ' + str(len(diamond_list)-3) + '개' if len(diamond_list) > 3 else ''}"
+            f"💎 다이아몬드 등급 키워드: {', '.join(heads['diamond'])} "
+            f"{'외 ' + str(counts['diamond'] - len(heads['diamond'])) + '개' if counts['diamond'] > len(heads['diamond']) else ''}"
         )
     
-    if gold_list:
+    if counts['gold']:
         review_parts.append(
-            f"🌟 골드 등급 키워드: {', '.join(gold_list[:3])} "
-            f"{'외 ' + str(len(gold_list)-3) + '개' if len(gold_list) > 3 else ''}"
+            f"🌟 골드 등급 키워드: {', '.join(heads['gold'])} "
+            f"{'외 ' + str(counts['gold'] - len(heads['gold'])) + '개' if counts['gold'] > len(heads['gold']) else ''}"
         )
     
-    if blueocean_list:
+    if counts['blueocean']:
         review_parts.append(
-            f"🔥 블루오션 키워드(경쟁강도 1.0 미만): {', '.join(blueocean_list[:5])}"
+            f"🔥 블루오션 키워드(경쟁강도 1.0 미만): {', '.join(heads['blueocean'])}"
         )
     
     review_parts.append(
@@ -253,28 +2130,8 @@ def generate_keyword_review(data):
     return '\n\n'.join(review_parts)
 
 
-def create_archive_html(data, filename):
-    """아카이브 HTML 생성 (광고 포함)"""
-    now_str = datetime.now(KST).strftime("%Y년 %m월 %d일 %H시")
-    date_only = datetime.now(KST).strftime("%Y년 %m월 %d일")
-    
-    # 통계 계산
-    diamond_count = len([i for i in data if 'DIAMOND' in i.get('grade', '')])
-    blueocean_count = len([i for i in data if i.get('efficiency', 999) < 1.0])
-    
-    # SEO 문장형 요약
-    seo_summary = generate_seo_summary(data, date_only)
-    
-    # 키워드 총평
-    keyword_review = generate_keyword_review(data)
-
-    # 테이블 행 생성 (5개마다 광고 삽입)
-    rows = ""
-    for i, item in enumerate(data):
-        
-        # 5개마다 광고 행 삽입
-        if i > 0 and i % 5 == 0:
-            rows += f'''
+# 아카이브 테이블 광고 행 (5개마다 삽입)
+ARCHIVE_AD_ROW = f'''
             <tr class="ad-row">
                 <td colspan="6" class="ad-cell">
                     <ins class="adsbygoogle"
@@ -286,37 +2143,41 @@ def create_archive_html(data, filename):
                 </td>
             </tr>
             '''
-        
-        badge_class = 'badge-coupang' if item['source'] == 'COUPANG' else 'badge-naver'
-        badge_icon = 'shopping-cart' if item['source'] == 'COUPANG' else 'shopping-bag'
-        
-        grade_class = 'grade-bad'
-        grade_icon = ''
-        
-        if "DIAMOND" in item['grade']:
-            grade_class = 'grade-diamond'
-            grade_icon = '<i data-lucide="gem"></i>'
-        elif "GOLD" in item['grade']:
-            grade_class = 'grade-gold'
-            grade_icon = '<i data-lucide="star"></i>'
-        elif "SILVER" in item['grade']:
-            grade_class = 'grade-silver'
-            grade_icon = '<i data-lucide="sparkles"></i>'
-        
-        eff_class = ''
-        eff_icon = ''
-        comp = item.get('efficiency', 999.99)
-        
-        if comp < 1.0:
-            eff_class = 'eff-good'
-            eff_icon = '<i data-lucide="flame"></i>'
-        elif comp > 5.0:
-            eff_class = 'eff-bad'
-            eff_icon = '<i data-lucide="droplet"></i>'
+ARCHIVE_AD_INTERVAL = 5
 
-        escaped_kw = item['keyword'].replace("'", "\\'").replace('"', '\\"')
 
-        rows += f"""
+def render_archive_row(item):
+    """아카이브 테이블 키워드 행 HTML"""
+    badge_class = 'badge-coupang' if item['source'] == 'COUPANG' else 'badge-naver'
+    badge_icon = 'shopping-cart' if item['source'] == 'COUPANG' else 'shopping-bag'
+    
+    grade_class = 'grade-bad'
+    grade_icon = ''
+    
+    if "DIAMOND" in item['grade']:
+        grade_class = 'grade-diamond'
+        grade_icon = '<i data-lucide="gem"></i>'
+    elif "GOLD" in item['grade']:
+        grade_class = 'grade-gold'
+        grade_icon = '<i data-lucide="star"></i>'
+    elif "SILVER" in item['grade']:
+        grade_class = 'grade-silver'
+        grade_icon = '<i data-lucide="sparkles"></i>'
+    
+    eff_class = ''
+    eff_icon = ''
+    comp = item.get('efficiency', 999.99)
+    
+    if comp < 1.0:
+        eff_class = 'eff-good'
+        eff_icon = '<i data-lucide="flame"></i>'
+    elif comp > 5.0:
+        eff_class = 'eff-bad'
+        eff_icon = '<i data-lucide="droplet"></i>'
+
+    escaped_kw = item['keyword'].replace("'", "\\'").replace('"', '\\"')
+
+    return f"""
         <tr>
             <td data-label="출처">
                 <span class="badge {badge_class}">
@@ -352,11 +2213,9 @@ def create_archive_html(data, filename):
             <td data-label="블로그수" class="num-col">{item['blog_count']:,}</td>
         </tr>"""
 
-    # 총평 HTML 변환
-    review_html = keyword_review.replace('\n', '<br>')
 
-    # 광고 단위 HTML
-    ad_unit = f'''
+# 광고 단위 HTML
+ARCHIVE_AD_UNIT = f'''
     <div class="ad-container ad-inline">
         <ins class="adsbygoogle"
              style="display:block"
@@ -367,24 +2226,25 @@ def create_archive_html(data, filename):
     </div>
     '''
 
-    html_content = f"""<!DOCTYPE html>
+# 아카이브 머리말/꼬리말 템플릿 (${필드} 치환)
+ARCHIVE_HEAD_TEMPLATE = """<!DOCTYPE html>
 <html lang="ko">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     
-    <title>{now_str} 황금 키워드 리포트 | 블루오션 키워드 분석</title>
-    <meta name="description" content="{date_only} 기준 네이버, 쿠팡 실시간 트렌드 분석. {data[0]['keyword'] if data else ''} 등 황금 키워드 {len(data)}개 발굴. 다이아몬드 {diamond_count}개, 블루오션 {blueocean_count}개.">
-    <meta name="keywords" content="황금키워드, 블루오션키워드, {', '.join([i['keyword'] for i in data[:5]])}">
+    <title>${now_str} 황금 키워드 리포트 | 블루오션 키워드 분석</title>
+    <meta name="description" content="${date_only} 기준 네이버, 쿠팡 실시간 트렌드 분석. ${top_keyword} 등 황금 키워드 ${total}개 발굴. 다이아몬드 ${diamond_count}개, 블루오션 ${blueocean_count}개.">
+    <meta name="keywords" content="황금키워드, 블루오션키워드, ${meta_keywords}">
     <meta name="robots" content="index, follow">
     
     <meta property="og:type" content="article">
-    <meta property="og:title" content="{now_str} 황금 키워드 리포트">
-    <meta property="og:description" content="다이아몬드 {diamond_count}개, 블루오션 {blueocean_count}개 발견!">
+    <meta property="og:title" content="${now_str} 황금 키워드 리포트">
+    <meta property="og:description" content="다이아몬드 ${diamond_count}개, 블루오션 ${blueocean_count}개 발견!">
     <meta property="og:locale" content="ko_KR">
     
     <!-- AdSense -->
-    <script async src="https://pagead2.googlesyndication.com/pagead/js/adsbygoogle.js?client={ADSENSE_CLIENT}"
+    <script async src="https://pagead2.googlesyndication.com/pagead/js/adsbygoogle.js?client=${adsense_client}"
          crossorigin="anonymous"></script>
     
     <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/pretendard@latest/dist/web/static/pretendard.css">
@@ -396,7 +2256,7 @@ def create_archive_html(data, filename):
     <link rel="stylesheet" href="../../css/responsive.css">
     
     <style>
-        .back-btn {{
+        .back-btn {
             display: inline-flex;
             align-items: center;
             gap: 8px;
@@ -409,14 +2269,14 @@ def create_archive_html(data, filename):
             font-size: 0.85rem;
             font-weight: 600;
             transition: var(--transition);
-        }}
-        .back-btn:hover {{
+        }
+        .back-btn:hover {
             background: var(--bg-card-hover);
             color: var(--text-primary);
-        }}
-        .back-btn svg {{ width: 16px; height: 16px; }}
+        }
+        .back-btn svg { width: 16px; height: 16px; }
         
-        .review-section {{
+        .review-section {
             background: var(--bg-card);
             border: 1px solid var(--border-color);
             border-radius: var(--radius-xl);
@@ -424,43 +2284,43 @@ def create_archive_html(data, filename):
             margin-top: 28px;
             white-space: pre-line;
             line-height: 1.8;
-        }}
-        .review-section h3 {{
+        }
+        .review-section h3 {
             display: flex;
             align-items: center;
             gap: 10px;
             margin-bottom: 20px;
             font-size: 1.1rem;
-        }}
-        .review-content {{
+        }
+        .review-content {
             color: var(--text-secondary);
             font-size: 0.9rem;
-        }}
-        .review-content strong {{
+        }
+        .review-content strong {
             color: var(--text-primary);
-        }}
+        }
         
         /* 광고 스타일 */
-        .ad-container {{
+        .ad-container {
             margin: 1.5rem 0;
             min-height: 100px;
             display: flex;
             align-items: center;
             justify-content: center;
-        }}
-        .ad-inline {{
+        }
+        .ad-inline {
             padding: 0.5rem;
-        }}
-        .ad-row {{
+        }
+        .ad-row {
             background: transparent !important;
-        }}
-        .ad-row:hover {{
+        }
+        .ad-row:hover {
             background: transparent !important;
-        }}
-        .ad-cell {{
+        }
+        .ad-cell {
             padding: 1rem !important;
             text-align: center;
-        }}
+        }
     </style>
 </head>
 <body>
@@ -479,12 +2339,12 @@ def create_archive_html(data, filename):
             <section class="hero-section">
                 <div class="hero-header">
                     <div class="hero-icon"><i data-lucide="bar-chart-3"></i></div>
-                    <h1 class="hero-title">{now_str} 트렌드 분석</h1>
+                    <h1 class="hero-title">${now_str} 트렌드 분석</h1>
                 </div>
-                <div class="hero-content">{seo_summary}</div>
+                <div class="hero-content">${seo_summary}</div>
             </section>
 
-            {ad_unit}
+            ${ad_unit}
 
             <section class="table-card">
                 <div class="table-header">
@@ -508,18 +2368,20 @@ def create_archive_html(data, filename):
                             <th class="num-col">블로그수</th>
                         </tr>
                     </thead>
-                    <tbody>{rows}</tbody>
+                    <tbody>"""
+
+ARCHIVE_TAIL_TEMPLATE = """</tbody>
                 </table>
             </section>
 
-            {ad_unit}
+            ${ad_unit}
 
             <section class="review-section">
                 <h3><i data-lucide="clipboard-list"></i> 키워드 총평</h3>
-                <div class="review-content">{review_html}</div>
+                <div class="review-content">${review_html}</div>
             </section>
 
-            {ad_unit}
+            ${ad_unit}
 
             <footer class="footer">
                 <p>© 2025 황금 키워드 발굴기</p>
@@ -536,122 +2398,812 @@ def create_archive_html(data, filename):
         lucide.createIcons();
 
         // 광고 초기화
-        document.querySelectorAll('.adsbygoogle').forEach(function() {{
-            try {{ (adsbygoogle = window.adsbygoogle || []).push({{}}); }}
-            catch(e) {{}}
-        }});
+        document.querySelectorAll('.adsbygoogle').forEach(function() {
+            try { (adsbygoogle = window.adsbygoogle || []).push({}); }
+            catch(e) {}
+        });
 
-        function showToast(msg) {{
+        function showToast(msg) {
             const t = document.getElementById('toast');
             document.getElementById('toast-message').textContent = msg;
             t.classList.add('show');
             setTimeout(() => t.classList.remove('show'), 2500);
-        }}
+        }
 
-        function copyKeyword(kw, btn) {{
-            navigator.clipboard.writeText(kw).then(() => {{
+        function copyKeyword(kw, btn) {
+            navigator.clipboard.writeText(kw).then(() => {
                 btn.classList.add('copied');
                 btn.innerHTML = '<i data-lucide="check"></i> 복사됨';
                 lucide.createIcons();
                 showToast("'" + kw + "' 복사됨");
-                setTimeout(() => {{
+                setTimeout(() => {
                     btn.classList.remove('copied');
                     btn.innerHTML = '<i data-lucide="copy"></i> 복사';
                     lucide.createIcons();
-                }}, 1500);
-            }});
-        }}
+                }, 1500);
+            });
+        }
     </script>
 </body>
 </html>"""
+
+_TEMPLATE_FIELD = re.compile(r'\$\{(\w+)\}')
+
+
+def compile_template(template, static_fields=None):
+    """템플릿을 (고정 문자열, 필드명) 조각으로 분해 (정적 필드는 미리 치환)"""
+    static_fields = static_fields or {}
+    parts = []
+    literal = ''
+    pos = 0
+
+    for match in _TEMPLATE_FIELD.finditer(template):
+        literal += template[pos:match.start()]
+        name = match.group(1)
+        if name in static_fields:
+            literal += str(static_fields[name])
+        else:
+            parts.append((literal, name))
+            literal = ''
+        pos = match.end()
+
+    parts.append((literal + template[pos:], None))
+    return tuple(parts)
+
+
+@functools.lru_cache(maxsize=None)
+def archive_templates():
+    """컴파일된 아카이브 머리말/꼬리말 (프로세스당 1회)"""
+    static_fields = {'adsense_client': ADSENSE_CLIENT, 'ad_unit': ARCHIVE_AD_UNIT}
+    return (compile_template(ARCHIVE_HEAD_TEMPLATE, static_fields),
+            compile_template(ARCHIVE_TAIL_TEMPLATE, static_fields))
+
+
+def render_template(compiled, fields):
+    """컴파일된 템플릿에 동적 필드 채우기"""
+    return ''.join(literal + (str(fields[name]) if name else '') for literal, name in compiled)
+
+
+def iter_archive_html(data, now_str, date_only, summary=None):
+    """아카이브 HTML을 머리말/행/꼬리말 조각 단위로 생성"""
+    # 통계 계산 (상위 키워드는 힙으로 집계하므로 data 정렬 여부와 무관)
+    summary = summary or summarize_results(data)
+    top = summary['heads']['top']
+    
+    # SEO 문장형 요약 / 키워드 총평
+    fields = {
+        'now_str': now_str,
+        'date_only': date_only,
+        'top_keyword': top[0]['keyword'] if top else '',
+        'total': summary['total'],
+        'diamond_count': summary['counts']['diamond'],
+        'blueocean_count': summary['counts']['blueocean'],
+        'meta_keywords': ', '.join([i['keyword'] for i in top]),
+        'seo_summary': generate_seo_summary(data, date_only, summary),
+        'review_html': generate_keyword_review(data, summary).replace('\n', '<br>'),
+    }
+    head, tail = archive_templates()
+
+    yield render_template(head, fields)
+
+    # 테이블 행 (5개마다 광고 삽입)
+    for i, item in enumerate(data):
+        if i > 0 and i % ARCHIVE_AD_INTERVAL == 0:
+            yield ARCHIVE_AD_ROW
+        yield render_archive_row(item)
+
+    yield render_template(tail, fields)
+
+
+def create_archive_html(data, filename, generated_at=None, quiet=False, summary=None):
+    """아카이브 HTML 생성 (광고 포함, 파일에 스트리밍 기록)"""
+    generated_at = generated_at or datetime.now(KST)
+    now_str = generated_at.strftime("%Y년 %m월 %d일 %H시")
+    date_only = generated_at.strftime("%Y년 %m월 %d일")
     
-    with open(filename, "w", encoding='utf-8') as f:
-        f.write(html_content)
+    with atomic_open(filename) as f:
+        f.writelines(iter_archive_html(data, now_str, date_only, summary))
     
-    print(f"✅ 아카이브 생성: {filename}")
+    if not quiet:
+        print(f"✅ 아카이브 생성: {filename}")
+
+
+def save_archive_data(archive_filename, data, generated_at):
+    """아카이브 원본 데이터 저장 (rebuild-archives 재렌더링용)"""
+    path = ARCHIVE_DATA_DIR / f'{Path(archive_filename).stem}.json'
+    with atomic_open(path) as f:
+        json.dump({'generated_at': generated_at.isoformat(), 'keywords': data},
+                  f, ensure_ascii=False, separators=(',', ':'), default=json_default)
+
+
+def archive_template_fingerprint():
+    """템플릿 변경 감지용 해시 (머리말/꼬리말/광고/샘플 행 렌더링 결과)"""
+    sample = {'keyword': 'sample', 'source': 'NAVER', 'search_volume': 1, 'blog_count': 1,
+              'efficiency': 1.0, 'golden_score': 50, 'grade': GRADE_LABELS[2]}
+    digest = hashlib.sha256()
+    for part in (ARCHIVE_HEAD_TEMPLATE, ARCHIVE_TAIL_TEMPLATE, ARCHIVE_AD_UNIT, ARCHIVE_AD_ROW,
+                 ADSENSE_CLIENT, str(ARCHIVE_AD_INTERVAL), render_archive_row(sample)):
+        digest.update(part.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _rebuild_archive(task):
+    """프로세스 풀 작업: 원본 데이터로 아카이브 1개 재렌더링"""
+    data_path, html_path = task
+    payload = _read_json(Path(data_path), {})
+    create_archive_html(payload['keywords'], html_path,
+                        datetime.fromisoformat(payload['generated_at']), quiet=True)
+    return html_path
+
+
+def rebuild_archives(workers=None, force=False):
+    """저장된 원본 데이터로 아카이브 전체 재렌더링 (내용 해시가 같으면 건너뜀)"""
+    ensure_directories()
+    manifest_path = ARCHIVE_DATA_DIR / 'render_manifest.json'
+    manifest = _read_json(manifest_path, {})
+    fingerprint = archive_template_fingerprint()
 
+    tasks = []
+    keys = {}
+    skipped = 0
+    for data_path in sorted(ARCHIVE_DATA_DIR.glob('*.json')):
+        if data_path == manifest_path:
+            continue
+        html_path = ARCHIVE_DIR / f'{data_path.stem}.html'
+        key = hashlib.sha256(fingerprint.encode('ascii') + data_path.read_bytes()).hexdigest()
+        if not force and manifest.get(html_path.name) == key and html_path.exists():
+            skipped += 1
+            continue
+        tasks.append((str(data_path), str(html_path)))
+        keys[html_path.name] = key
 
-def save_data_json(data):
-    """data.json 저장"""
+    without_data = len([p for p in ARCHIVE_DIR.glob('*.html')
+                        if not (ARCHIVE_DATA_DIR / f'{p.stem}.json').exists()])
+
+    started = time.perf_counter()
+    if tasks:
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(tasks) // (workers * 4))
+        # 프로세스 풀(multiprocessing)은 재렌더링할 때만 로드
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for _ in executor.map(_rebuild_archive, tasks, chunksize=chunksize):
+                pass
+    elapsed = time.perf_counter() - started
+
+    manifest.update(keys)
+    _write_json(manifest_path, manifest)
+
+    rate = len(tasks) / elapsed if elapsed > 0 else 0
+    print(f"✅ 아카이브 재생성: {len(tasks)}개 ({rate:,.1f} files/sec), "
+          f"변경 없음 {skipped}개, 원본 데이터 없음 {without_data}개")
+    return len(tasks)
+
+
+def keyword_index_shard(key):
+    """정규화 키워드의 샤드 이름 (첫 글자 코드포인트 16진수, 프런트엔드와 같은 규칙)"""
+    return f'{ord(key[0]):04x}' if key else '0000'
+
+
+def _archive_postings(archive, data):
+    """아카이브 1개의 역색인 항목, {샤드: {정규화 키워드: (표기, [아카이브, 황금지수, 등급 코드, 순위])}}"""
+    grade_codes = {label: code for code, label in enumerate(GRADE_LABELS)}
+    shards = {}
+    for rank, item in enumerate(data, 1):
+        key = normalize_keyword(item['keyword'])
+        if not key:
+            continue
+        posting = [archive, item['golden_score'], grade_codes.get(item['grade'], len(GRADE_LABELS) - 1), rank]
+        # 같은 아카이브에 중복 표기가 있으면 순위가 높은 쪽만
+        shards.setdefault(keyword_index_shard(key), {}).setdefault(key, (item['keyword'], posting))
+    return shards
+
+
+def _merge_postings(index, postings):
+    """샤드 내용에 항목 추가 (항목 목록은 아카이브 이름 = 시간순 정렬 유지, 표기는 최신 것으로)"""
+    for key, (keyword, posting) in postings.items():
+        entry = index.setdefault(key, {'k': keyword, 'p': []})
+        if not entry['p'] or entry['p'][-1][0] < posting[0]:
+            entry['p'].append(posting)
+            entry['k'] = keyword
+        else:
+            bisect.insort(entry['p'], posting)
+
+
+def _write_keyword_shard(shard, index):
+    """샤드 파일 쓰기 (키 정렬, 공백 없는 JSON, 내용이 같으면 생략)"""
+    content_manifest().write_json(KEYWORD_INDEX_DIR / f'{shard}.json', index, sort_keys=True)
+
+
+def _write_index_archives(archive_shards):
+    """아카이브 → 샤드 목록 저장"""
+    content_manifest().write_json(KEYWORD_INDEX_DIR / KEYWORD_INDEX_ARCHIVES_NAME, archive_shards, sort_keys=True)
+
+
+def update_keyword_index(archive_filename, data):
+    """아카이브 1개를 역색인에 반영 (바뀌는 샤드만 다시 씀)
+
+    같은 아카이브를 다시 쓰면(같은 시간대 재실행) 이전 항목은 아카이브 이름으로 지운 뒤 추가.
+    이전 항목이 있는 샤드는 역색인에 함께 저장하는 아카이브별 샤드 목록으로 찾음 (아카이브 원본 데이터 불필요)"""
+    archive = Path(archive_filename).stem
+    shards = _archive_postings(archive, data)
+    archives_path = KEYWORD_INDEX_DIR / KEYWORD_INDEX_ARCHIVES_NAME
+    archive_shards = _read_json(archives_path, {})
+    previous = set(archive_shards.get(archive, []))
+    if archive not in archive_shards:
+        # 샤드 목록이 생기기 전에 만든 역색인: 원본 데이터가 남아 있으면 그것으로 찾음
+        previous_data = _read_json(ARCHIVE_DATA_DIR / f'{archive}.json', {}).get('keywords', [])
+        previous = {keyword_index_shard(normalize_keyword(item['keyword'])) for item in previous_data}
+
+    for shard in sorted(previous | set(shards)):
+        index = _read_json(KEYWORD_INDEX_DIR / f'{shard}.json', {})
+        for key in list(index):
+            entry = index[key]
+            entry['p'] = [posting for posting in entry['p'] if posting[0] != archive]
+            if not entry['p']:
+                del index[key]
+        _merge_postings(index, shards.get(shard, {}))
+        _write_keyword_shard(shard, index)
+
+    archive_shards[archive] = sorted(shards)
+    _write_index_archives(archive_shards)
+    print(f"✅ 키워드 역색인 업데이트: 샤드 {len(shards)}개")
+
+
+def rebuild_keyword_index():
+    """아카이브 원본 데이터 전체로 역색인 재생성"""
+    ensure_directories()
+    manifest = content_manifest()
+    for path in KEYWORD_INDEX_DIR.glob('*.json'):
+        manifest.remove(path)
+
+    shards = {}
+    archive_shards = {}
+    archives = 0
+    for data_path in sorted(ARCHIVE_DATA_DIR.glob('*.json')):
+        if data_path.name == 'render_manifest.json':
+            continue
+        postings = _archive_postings(data_path.stem, _read_json(data_path, {}).get('keywords', []))
+        for shard, entries in postings.items():
+            _merge_postings(shards.setdefault(shard, {}), entries)
+        archive_shards[data_path.stem] = sorted(postings)
+        archives += 1
+
+    for shard, index in shards.items():
+        _write_keyword_shard(shard, index)
+    _write_index_archives(archive_shards)
+    manifest.save()
+    print(f"✅ 키워드 역색인 재생성: 아카이브 {archives}개, 샤드 {len(shards)}개")
+
+
+@functools.lru_cache(maxsize=256)
+def _load_keyword_shard(path, version):
+    """샤드 파일 읽기 (파일 버전이 같으면 메모리 사본 재사용)"""
+    return _read_json(Path(path), {})
+
+
+def lookup_keyword(keyword):
+    """키워드의 아카이브별 기록 (시간순), [[아카이브, 황금지수, 등급 코드, 순위], ...]"""
+    key = normalize_keyword(keyword)
+    path = KEYWORD_INDEX_DIR / f'{keyword_index_shard(key)}.json'
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return []
+    # 원자적 교체로 파일이 바뀌면 inode/수정 시각이 달라짐
+    entry = _load_keyword_shard(str(path), (stat.st_ino, stat.st_mtime_ns)).get(key)
+    return list(entry['p']) if entry else []
+
+
+def last_grade_reached(keyword, grade=GRADE_LABELS[0]):
+    """키워드가 해당 등급 이상이었던 가장 최근 기록 (없으면 None)"""
+    code = GRADE_LABELS.index(grade)
+    for posting in reversed(lookup_keyword(keyword)):
+        if posting[2] <= code:
+            return posting
+    return None
+
+
+def dashboard_stats(data, summary):
+    """대시보드 통계 카드 값 (서버 집계)"""
+    return {
+        'total': summary['total'],
+        'diamond': summary['counts']['diamond'],
+        'blueocean': summary['counts']['blueocean'],
+        'sources': len({item['source'] for item in data}),
+    }
+
+
+def sort_orders(data, columns=SORTABLE_COLUMNS):
+    """정렬 가능한 열별 내림차순/오름차순 순열 (방향마다 안정 정렬이라 동점은 항상 원래 순서 유지)"""
+    import numpy as np
+
+    orders = {}
+    for column in columns:
+        values = np.fromiter((item[column] for item in data), dtype=np.float64, count=len(data))
+        orders[column] = {'desc': np.argsort(-values, kind='stable').tolist(),
+                          'asc': np.argsort(values, kind='stable').tolist()}
+    return orders
+
+
+def save_row_chunks(data, header, summary, chunk_size=None):
+    """가상 스크롤용 출력: data.index.json(통계/묶음 정보) + data_chunks/NNNN.json(행 묶음)
+    + data_chunks/order_<열>[_asc].json(정렬 순열, 첫 화면을 막지 않도록 해당 열/방향을 처음 정렬할 때 로드)"""
+    chunk_size = ROW_CHUNK_SIZE if chunk_size is None else chunk_size
+    chunk_count = -(-len(data) // chunk_size)
+    manifest = content_manifest()
+
+    # 바뀐 묶음만 교체 (묶음별 해시 목록은 data.json 변경 판정에도 사용)
+    digests = []
+    written = 0
+    for number in range(chunk_count):
+        payload = _dump_json_bytes(data[number * chunk_size:(number + 1) * chunk_size])
+        digests.append(content_hash(payload))
+        written += manifest.write_bytes(ROW_CHUNK_DIR / f'{number:04d}.json', payload, digests[-1])
+
+    # 행 수가 줄었으면 남은 이전 묶음 삭제
+    for path in ROW_CHUNK_DIR.glob('*.json'):
+        if path.stem.isdigit() and int(path.stem) >= chunk_count:
+            manifest.remove(path)
+
+    orders = {}
+    for column, directions in sort_orders(data).items():
+        orders[column] = {}
+        for direction, order in directions.items():
+            name = f'order_{column}.json' if direction == 'desc' else f'order_{column}_{direction}.json'
+            manifest.write_json(ROW_CHUNK_DIR / name, order)
+            orders[column][direction] = name
+
+    index = dict(header, stats=dashboard_stats(data, summary), count=len(data),
+                 chunk_size=chunk_size, chunk_count=chunk_count,
+                 chunk_path=f'{ROW_CHUNK_DIR.name}/', orders=orders)
+    manifest.write_json(OUTPUT_DIR / 'data.index.json', index)
+    print(f"✅ 정렬 순열/행 묶음 저장: data.index.json, {ROW_CHUNK_DIR} ({written}/{chunk_count}개 변경)")
+    return digests
+
+
+def save_data_json(data, summary=None):
+    """data.json 저장 (대시보드 첫 화면은 data.index.json + 행 묶음으로 로드)"""
     date_only = datetime.now(KST).strftime("%Y년 %m월 %d일")
     
-    output = {
+    summary = summary or summarize_results(data)
+    header = {
         'generated_at': datetime.now(KST).isoformat(),
-        'seo_summary': generate_seo_summary(data, date_only),
-        'keyword_review': generate_keyword_review(data),
-        'keywords': data
+        'seo_summary': generate_seo_summary(data, date_only, summary),
+        'keyword_review': generate_keyword_review(data, summary),
     }
-    
+    chunk_digests = save_row_chunks(data, header, summary)
+
+    # data.json 해시는 전체를 직렬화하지 않고 헤더 + 행 묶음 해시로 계산
+    manifest = content_manifest()
+    manifest.stamp(header['generated_at'])
     output_path = OUTPUT_DIR / 'data.json'
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
-    
-    print(f"✅ 데이터 저장: {output_path}")
+    digest = content_hash(_dump_json_bytes(header) + ''.join(chunk_digests).encode('ascii'))
+    if manifest.unchanged(output_path, digest):
+        manifest.skipped += 1
+        print(f"✅ 데이터 변경 없음: {output_path} 유지")
+    else:
+        with atomic_open(output_path) as f:
+            json.dump(dict(header, keywords=data), f, ensure_ascii=False, indent=2, default=json_default)
+        manifest.record(output_path, digest)
+        print(f"✅ 데이터 저장: {output_path}")
 
 
-def update_archive_list():
-    """archive_list.json 업데이트"""
-    archive_files = sorted(
-        [f.name for f in ARCHIVE_DIR.glob('*.html')],
-        reverse=True
-    )
-    
+@contextlib.contextmanager
+def atomic_open(path, mode='w'):
+    """임시 파일에 쓴 뒤 os.replace로 교체 (읽는 쪽은 이전 파일 또는 완성된 파일만 봄)"""
+    path = Path(path)
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    try:
+        with open(tmp_path, mode, encoding=None if 'b' in mode else 'utf-8') as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+
+
+def _read_json(path, default):
+    """JSON 파일 읽기 (없으면 기본값)"""
+    if not path.exists():
+        return default
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json(path, data, indent=2):
+    """JSON 파일 쓰기 (원자적 교체)"""
+    with atomic_open(path) as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent, default=json_default)
+
+
+_VOLATILE_JSON = re.compile(rb'"(' + b'|'.join(re.escape(key.encode()) for key in CONTENT_VOLATILE_KEYS)
+                            + rb')":\s*"[^"]*"')
+
+
+def content_hash(payload, volatile=True):
+    """출력물 내용 해시 (SHA-256 앞 16자리, 캐시 무효화 버전으로도 사용)
+
+    volatile이면 JSON의 생성 시각 값을 비우고 계산 (생성 시각만 다르면 같은 내용으로 봄)"""
+    if volatile:
+        payload = _VOLATILE_JSON.sub(rb'"\1":""', payload)
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def _dump_json_bytes(data, indent=None, sort_keys=False):
+    """JSON 직렬화 (indent 없으면 공백 없는 형식)"""
+    return json.dumps(data, ensure_ascii=False, indent=indent, separators=None if indent else (',', ':'),
+                      sort_keys=sort_keys, default=json_default).encode('utf-8')
+
+
+class ContentManifest:
+    """출력물별 내용 해시 장부 (OUTPUT_DIR 기준 상대 경로 → 해시) + 마지막 실행 시각
+
+    해시가 같고 파일이 있으면 쓰기를 생략해 git 커밋/CDN 캐시가 바뀐 파일에만 생기게 함
+    (생성 시각만 바뀐 출력물은 그대로 두므로 프런트엔드는 매니페스트의 generated_at을 업데이트 시간으로 표시)"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.path = self.root / CONTENT_MANIFEST_NAME
+        saved = _read_json(self.path, {})
+        self.generated_at = saved.get('generated_at')
+        self.hashes = saved.get('files', {})
+        self.written = 0
+        self.skipped = 0
+        self._dirty = False
+
+    def _key(self, path):
+        return Path(path).relative_to(self.root).as_posix()
+
+    def unchanged(self, path, digest):
+        """이전에 같은 내용을 쓴 파일이 그대로 있으면 True"""
+        return self.hashes.get(self._key(path)) == digest and Path(path).exists()
+
+    def write_bytes(self, path, payload, digest=None):
+        """내용이 바뀐 경우에만 원자적 교체, 썼으면 True"""
+        digest = digest or content_hash(payload)
+        if self.unchanged(path, digest):
+            self.skipped += 1
+            return False
+        with atomic_open(path, 'wb') as f:
+            f.write(payload)
+        self.record(path, digest)
+        return True
+
+    def record(self, path, digest):
+        """호출 측에서 직접 쓴 출력물의 해시 기록"""
+        self.hashes[self._key(path)] = digest
+        self.written += 1
+        self._dirty = True
+
+    def write_json(self, path, data, indent=None, sort_keys=False):
+        """JSON 출력물 쓰기 (생성/조회 시각만 다르면 이전 파일 유지)"""
+        return self.write_bytes(path, _dump_json_bytes(data, indent, sort_keys))
+
+    def stamp(self, generated_at):
+        """이번 실행의 생성 시각 기록"""
+        if generated_at != self.generated_at:
+            self.generated_at = generated_at
+            self._dirty = True
+
+    def remove(self, path):
+        """출력물 삭제 (장부에서도 제거)"""
+        path = Path(path)
+        if path.exists():
+            path.unlink()
+        if self.hashes.pop(self._key(path), None) is not None:
+            self._dirty = True
+
+    def save(self):
+        """바뀐 내용이 있을 때만 매니페스트 저장"""
+        if self._dirty:
+            with atomic_open(self.path, 'wb') as f:
+                f.write(_dump_json_bytes({'generated_at': self.generated_at, 'files': self.hashes},
+                                         sort_keys=True))
+            self._dirty = False
+
+    def summary(self):
+        return f"쓰기 {self.written}개, 변경 없음 {self.skipped}개"
+
+
+_content_manifests = {}
+
+
+def content_manifest():
+    """현재 OUTPUT_DIR의 내용 해시 장부 (실행 중 공유)"""
+    if OUTPUT_DIR not in _content_manifests:
+        _content_manifests[OUTPUT_DIR] = ContentManifest(OUTPUT_DIR)
+    return _content_manifests[OUTPUT_DIR]
+
+
+def archive_entry(filename, data=None, summary=None):
+    """아카이브 색인 항목 (파일명 YYYY-MM-DD_HHh.html 기준)"""
+    entry = {
+        'file': filename,
+        'timestamp': datetime.strptime(filename[:13], "%Y-%m-%d_%H").replace(tzinfo=KST).isoformat(),
+        'keyword_count': None,
+        'top_keyword': None,
+        'diamond_count': None,
+    }
+    if data is not None:
+        summary = summary or summarize_results(data)
+        top = summary['heads']['top']
+        entry['keyword_count'] = summary['total']
+        entry['top_keyword'] = top[0]['keyword'] if top else None
+        entry['diamond_count'] = summary['counts']['diamond']
+    return entry
+
+
+def _append_archive_entry(index, entry):
+    """월별 페이지에 항목 추가 (같은 파일명은 교체), 색인 갱신"""
+    month = entry['file'][:7]
+    page_path = ARCHIVE_INDEX_DIR / f'{month}.json'
+    page = _read_json(page_path, [])
+
+    if page and page[-1]['file'] == entry['file']:
+        page[-1] = entry
+    else:
+        page.append(entry)
+    content_manifest().write_json(page_path, page, indent=2)
+
+    months = index['months']
+    if months and months[0]['month'] == month:
+        months[0]['count'] = len(page)
+        months[0]['latest'] = entry['file']
+    else:
+        months.insert(0, {'month': month, 'count': len(page), 'latest': entry['file']})
+    index['total'] = sum(m['count'] for m in months)
+
+
+def _bootstrap_archive_index():
+    """색인이 없을 때 기존 아카이브 파일로 1회 생성 (월별 페이지 단위로 기록)"""
+    pages = {}
+    for path in sorted(ARCHIVE_DIR.glob('*.html')):
+        pages.setdefault(path.name[:7], []).append(archive_entry(path.name))
+
+    months = []
+    for month in sorted(pages, reverse=True):
+        content_manifest().write_json(ARCHIVE_INDEX_DIR / f'{month}.json', pages[month], indent=2)
+        months.append({'month': month, 'count': len(pages[month]), 'latest': pages[month][-1]['file']})
+    return {'total': sum(m['count'] for m in months), 'months': months}
+
+
+def update_archive_list(entry=None):
+    """아카이브 색인 증분 갱신 (월별 페이지 추가 + 최근 목록 archive_list.json)"""
+    index_path = ARCHIVE_INDEX_DIR / 'index.json'
     list_path = OUTPUT_DIR / 'archive_list.json'
-    with open(list_path, 'w', encoding='utf-8') as f:
-        json.dump(archive_files, f, ensure_ascii=False, indent=2)
-    
-    print(f"✅ 아카이브 목록 업데이트: {len(archive_files)}개")
 
+    if index_path.exists():
+        index = _read_json(index_path, {'total': 0, 'months': []})
+        recent = _read_json(list_path, [])
+    else:
+        index = _bootstrap_archive_index()
+        recent = sorted([f.name for f in ARCHIVE_DIR.glob('*.html')], reverse=True)
 
-def main():
-    """메인 실행 함수"""
-    print("🚀 황금 키워드 발굴기 시작...")
-    print(f"⏰ 실행 시간: {datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S KST')}")
-    
+    if entry is not None:
+        _append_archive_entry(index, entry)
+        recent = [entry['file']] + [name for name in recent if name != entry['file']]
+
+    manifest = content_manifest()
+    manifest.write_json(index_path, index, indent=2)
+    manifest.write_json(list_path, recent[:ARCHIVE_LIST_LIMIT], indent=2)
+
+    print(f"✅ 아카이브 목록 업데이트: {index['total']}개")
+
+
+def run_pipeline(resume=False, dry_run=False, shards=None):
+    """수집 → 분석 → 저장 → 렌더링 파이프라인
+
+    resume: 이전 실행 저널에서 이어서 분석, dry_run: 캐시/이력/저널 없이 분석만 하고 출력물은 저장 안 함,
+    shards: 분석/채점 프로세스 수 (2 이상이면 수집이 끝난 뒤 샤드별로 나눠 분석)"""
+    shards = ANALYZE_SHARDS if shards is None else shards
     # 디렉토리 확인
     ensure_directories()
     
-    # 키워드 수집
+    # 키워드 수집 (쿠팡 카테고리 수집은 생성기로 분석 단계에 바로 흘려보냄)
     print("\n📥 키워드 수집 중...")
-    naver_keywords = get_naver_shopping_keywords()
-    coupang_keywords = get_coupang_trending_keywords()
+    with METRICS.stage('collect'):
+        naver_keywords = get_naver_shopping_keywords()
     
-    all_keywords = naver_keywords + coupang_keywords
-    print(f"   - 네이버: {len(naver_keywords)}개")
-    print(f"   - 쿠팡: {len(coupang_keywords)}개")
-    print(f"   - 총: {len(all_keywords)}개")
+    # 이전 실행에서 일일 한도로 이월된 키워드는 이번 수집분 뒤에 이어서 조회
+    carried = SCHEDULER.take_deferred()
+    coupang_stats = {}
+    dedupe_stats = {}
+    all_keywords = iter_dedupe_keywords(
+        itertools.chain(naver_keywords, iter_coupang_trending_keywords(stats=coupang_stats), carried),
+        dedupe_stats)
     
     # 키워드 분석
-    print("\n🔍 키워드 분석 중...")
-    results = analyze_keywords(all_keywords)
+    print(f"\n🔍 수집/분석 중... (동시 조회 {ENRICH_WORKERS}개" + (f", 샤드 {shards}개)" if shards > 1 else ")"))
+    cache = LookupCache(CACHE_PATH) if CACHE_ENABLED and not dry_run else None
+    history = KeywordHistory(HISTORY_PATH) if HISTORY_ENABLED and not dry_run else None
+    previous = load_previous_results() if INCREMENTAL_ENABLED and not dry_run else None
+    journal = RunJournal(RUN_JOURNAL_PATH, resume=resume) if not dry_run else None
+    with METRICS.stage('analyze'):
+        try:
+            if previous is not None:
+                results, refreshed = analyze_keywords_incremental(all_keywords, previous, cache=cache,
+                                                                  history=history, journal=journal,
+                                                                  shards=shards)
+            else:
+                results = refreshed = analyze_keywords_sharded(all_keywords, shards=shards, cache=cache,
+                                                               history=history, journal=journal)
+        finally:
+            # 중단되더라도 조회 완료분은 디스크에 남김
+            if journal is not None:
+                journal.close()
+    
+    duplicates = dedupe_stats['duplicates']
+    METRICS.count('dedupe.duplicates', duplicates)
+    print(f"   - 네이버: {len(naver_keywords)}개")
+    print(f"   - 쿠팡: {coupang_stats['keywords']}개" + (
+        f" (카테고리 {coupang_stats['categories']}개, 실패 {coupang_stats['failed']}개)"
+        if 'categories' in coupang_stats else ''))
+    if carried:
+        print(f"   - 이월: {len(carried)}개")
+    print(f"   - 총: {dedupe_stats['candidates'] - duplicates}개 "
+          f"(중복 {duplicates}개 병합, 조회 {duplicates * len(PROVIDERS)}회 절약)")
+    
+    if EXPANSION_ENABLED:
+        print(f"\n🌱 연관 키워드 확장 중... (깊이 {EXPANSION_MAX_DEPTH}, 예산 {EXPANSION_BUDGET}개)")
+        with METRICS.stage('expand'):
+            seeds = {id(item) for item in results}
+            results = expand_keywords(results, cache=cache, history=history,
+                                      checkpoint_path=None if dry_run else EXPANSION_CHECKPOINT_PATH)
+            discovered = [item for item in results if id(item) not in seeds]
+            refreshed = refreshed + discovered
+        print(f"   - 새 키워드: {len(discovered)}개")
+    
+    # 이력에는 이번 실행에서 실제로 조회한 결과만 추가
+    if history is not None:
+        with METRICS.stage('history'):
+            history.append(refreshed)
+        history.close()
     
     # 통계
-    diamond_count = len([i for i in results if 'DIAMOND' in i.get('grade', '')])
-    gold_count = len([i for i in results if 'GOLD' in i.get('grade', '')])
-    blueocean_count = len([i for i in results if i.get('efficiency', 999) < 1.0])
+    summary = summarize_results(results)
+    diamond_count = summary['counts']['diamond']
+    gold_count = summary['counts']['gold']
+    blueocean_count = summary['counts']['blueocean']
     
     print(f"\n📊 분석 결과:")
     print(f"   - 💎 DIAMOND: {diamond_count}개")
     print(f"   - 🌟 GOLD: {gold_count}개")
     print(f"   - 🔥 블루오션: {blueocean_count}개")
+    estimated_count = len([i for i in results if i.get('estimated')])
+    if estimated_count:
+        print(f"   - ⚠️ 추정값 포함: {estimated_count}개")
+    if cache is not None:
+        print(f"   - 🗃️ 조회 캐시: {cache.summary()}")
+        METRICS.count('cache.hits', sum(cache.hits.values()))
+        METRICS.count('cache.misses', sum(cache.misses.values()))
+        cache.close()
+    print(f"   - 📮 일일 호출량: {SCHEDULER.summary()}")
+    
+    if dry_run:
+        print("   - 드라이 런: 출력물 저장 생략")
+        return None
+    
+    # 모든 키워드가 이월되면 이전 출력물 유지
+    if not results and SCHEDULER.deferred:
+        print("   - 분석된 키워드 없음: 이전 data.json/아카이브 유지")
+        journal.discard()
+        return None
+    
+    # 증분 모드: 변경 사항이 없으면 출력물 재생성 생략
+    if previous is not None:
+        diff = diff_results(previous, results)
+        _write_json(OUTPUT_DIR / 'diff.json', diff)
+        print(f"\n🔀 변경 사항: 추가 {len(diff['added'])}개, 삭제 {len(diff['removed'])}개, "
+              f"등급 변경 {len(diff['grade_changed'])}개, 값 변경 {len(diff['changed'])}개")
+        if not has_changes(diff):
+            print("   - 변경 없음: data.json/아카이브 재생성 생략")
+            journal.discard()
+            return None
     
     # 데이터 저장
     print("\n💾 데이터 저장 중...")
-    save_data_json(results)
+    with METRICS.stage('save'):
+        save_data_json(results, summary=summary)
     
-    # 아카이브 HTML 생성
-    archive_filename = datetime.now(KST).strftime("%Y-%m-%d_%Hh.html")
+    # 아카이브 HTML 생성 (재렌더링용 원본 데이터 함께 저장)
+    generated_at = datetime.now(KST)
+    archive_filename = generated_at.strftime("%Y-%m-%d_%Hh.html")
     archive_path = ARCHIVE_DIR / archive_filename
-    create_archive_html(results, archive_path)
+    with METRICS.stage('render'):
+        create_archive_html(results, archive_path, generated_at, summary=summary)
+    
+    # 키워드 역색인 업데이트 (덮어쓰기 전 원본 데이터로 이전 항목을 찾으므로 저장보다 먼저)
+    with METRICS.stage('keyword_index'):
+        update_keyword_index(archive_filename, results)
+    save_archive_data(archive_filename, results, generated_at)
     
     # 아카이브 목록 업데이트
-    update_archive_list()
+    with METRICS.stage('archive_index'):
+        update_archive_list(archive_entry(archive_filename, results, summary))
+    
+    # 내용 해시 매니페스트는 모든 출력물을 쓴 뒤 한 번만 저장
+    manifest = content_manifest()
+    manifest.save()
+    print(f"✅ 내용 해시 매니페스트: {manifest.summary()}")
+    
+    # 모든 출력이 저장된 뒤에만 저널 삭제
+    journal.discard()
+    
+    return archive_filename
+
+
+def parse_args(argv=None):
+    """명령행 인자"""
+    import argparse
+    parser = argparse.ArgumentParser(description='황금 키워드 발굴기')
+    parser.add_argument('command', nargs='?', choices=['run', 'rebuild-archives', 'rebuild-index', 'lookup'],
+                        default='run',
+                        help='run: 수집/분석 실행 (기본), rebuild-archives: 저장된 데이터로 아카이브 재렌더링, '
+                             'rebuild-index: 키워드 역색인 재생성, lookup: 키워드의 아카이브별 기록 조회')
+    parser.add_argument('keyword', nargs='?', help='lookup 대상 키워드')
+    parser.add_argument('--workers', type=int, default=None, help='rebuild-archives 프로세스 수 (기본: CPU 코어 수)')
+    parser.add_argument('--force', action='store_true', help='rebuild-archives: 변경 없는 파일도 재렌더링')
+    parser.add_argument('--resume', action='store_true', help='run: 중단된 실행의 저널(checkpoint.jsonl)에서 이어서 분석')
+    parser.add_argument('--shards', type=int, default=None,
+                        help=f'run: 분석/채점 프로세스 수 (기본 ANALYZE_SHARDS={ANALYZE_SHARDS}, 1이면 단일 프로세스)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='run: 오프라인 점검 실행 (제공자/네트워크 없이 추정값으로 분석, 출력물 저장 안 함)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """메인 실행 함수"""
+    global OFFLINE_MODE
+    args = parse_args(argv)
+    if args.dry_run:
+        OFFLINE_MODE = True
+    if args.command == 'rebuild-archives':
+        print("🔁 아카이브 재렌더링...")
+        rebuild_archives(workers=args.workers, force=args.force)
+        return
+    if args.command == 'rebuild-index':
+        print("🔁 키워드 역색인 재생성...")
+        rebuild_keyword_index()
+        return
+    if args.command == 'lookup':
+        for archive, score, code, rank in lookup_keyword(args.keyword or ''):
+            print(f"{archive}  {rank:>4}위  {score:>5}  {GRADE_LABELS[code]}")
+        return
+    
+    print("🚀 황금 키워드 발굴기 시작...")
+    print(f"⏰ 실행 시간: {datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S KST')}")
+    
+    try:
+        if RUN_PROFILE:
+            import cProfile
+            profiler = cProfile.Profile()
+            archive_filename = profiler.runcall(run_pipeline, args.resume, args.dry_run, args.shards)
+            profiler.dump_stats(str(OUTPUT_DIR / 'run_profile.prof'))
+            print(f"✅ 프로파일 저장: {OUTPUT_DIR / 'run_profile.prof'}")
+        else:
+            archive_filename = run_pipeline(args.resume, args.dry_run, args.shards)
+    finally:
+        # 중단되더라도 오늘 사용량은 다음 실행에 반영 (드라이 런은 장부를 건드리지 않음)
+        if not args.dry_run:
+            SCHEDULER.save()
+    
+    if METRICS.enabled:
+        METRICS.save(OUTPUT_DIR / 'run_metrics.json')
+    
+    if args.dry_run:
+        print("\n✨ 완료! (드라이 런: 저장된 출력물 없음)")
+        return
     
     print("\n✨ 완료!")
     print(f"📁 출력 파일:")
     print(f"   - output/data.json")
     print(f"   - output/archive_list.json")
-    print(f"   - output/archives/{archive_filename}")
+    if archive_filename:
+        print(f"   - output/archives/{archive_filename}")
 
 
 if __name__ == "__main__":
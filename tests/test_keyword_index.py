@@ -0,0 +1,43 @@
+"""키워드 역색인 갱신 검증 (같은 아카이브 재실행, 아카이브 원본 데이터 없음)"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def output_dir(monkeypatch, tmp_path):
+    """역색인만 있는 출력 경로 (CI 체크아웃처럼 archive_data 디렉토리 없음)"""
+    monkeypatch.setattr(main, 'OUTPUT_DIR', tmp_path)
+    monkeypatch.setattr(main, 'KEYWORD_INDEX_DIR', tmp_path / 'keyword_index')
+    monkeypatch.setattr(main, 'ARCHIVE_DATA_DIR', tmp_path / 'archive_data')
+    main.KEYWORD_INDEX_DIR.mkdir()
+    return tmp_path
+
+
+def ranked(*pairs):
+    return [{'keyword': keyword, 'golden_score': score, 'grade': main.get_grade(score)} for keyword, score in pairs]
+
+
+def test_rerun_of_same_archive_replaces_postings_without_archive_data():
+    main.update_keyword_index('2026-10-18_18h.html', ranked(('사과', 80), ('바나나', 70)))
+    main.update_keyword_index('2026-10-18_18h.html', ranked(('사과', 100), ('체리', 60)))
+
+    assert not main.ARCHIVE_DATA_DIR.exists()
+    assert main.lookup_keyword('사과') == [['2026-10-18_18h', 100, 0, 1]]
+    # 재실행 결과에서 빠진 키워드(다른 샤드)의 이전 항목도 제거
+    assert main.lookup_keyword('바나나') == []
+    assert main.lookup_keyword('체리') == [['2026-10-18_18h', 60, 1, 2]]
+
+
+def test_rerun_keeps_postings_from_other_archives():
+    main.update_keyword_index('2026-10-18_08h.html', ranked(('사과', 50), ('바나나', 90)))
+    main.update_keyword_index('2026-10-18_18h.html', ranked(('사과', 80)))
+    main.update_keyword_index('2026-10-18_18h.html', ranked(('사과', 85)))
+
+    assert main.lookup_keyword('사과') == [['2026-10-18_08h', 50, 2, 1], ['2026-10-18_18h', 85, 0, 1]]
+    assert main.lookup_keyword('바나나') == [['2026-10-18_08h', 90, 0, 2]]
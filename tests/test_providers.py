@@ -0,0 +1,310 @@
+"""제공자 클라이언트를 녹화된 응답(tests/fixtures)을 돌려주는 로컬 http.server로 검증"""
+import base64
+import hashlib
+import hmac
+import json
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / 'fixtures'
+KEYWORD_TOOL = json.loads((FIXTURES / 'searchad_keywordstool.json').read_text(encoding='utf-8'))
+BEST_CATEGORIES = json.loads((FIXTURES / 'coupang_bestcategories.json').read_text(encoding='utf-8'))
+
+
+class FixtureServer:
+    """경로별 응답 함수를 등록하는 로컬 서버 (받은 요청은 requests에 기록)"""
+
+    def __init__(self):
+        self.routes = []
+        self.requests = []
+        self._lock = threading.Lock()
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                path, _, query = self.path.partition('?')
+                with fixture._lock:
+                    fixture.requests.append({'path': path, 'query': query, 'headers': dict(self.headers)})
+                status, headers, body = fixture.respond(path, parse_qs(query))
+                payload = body if isinstance(body, bytes) else json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self._server.server_port}'
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def route(self, pattern, handler):
+        self.routes.append((re.compile(pattern), handler))
+
+    def respond(self, path, query):
+        for pattern, handler in self.routes:
+            match = pattern.fullmatch(path)
+            if match:
+                return handler(match, query)
+        return 404, {}, {'message': 'not found'}
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def server():
+    fixture = FixtureServer()
+    yield fixture
+    fixture.close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_scheduler(monkeypatch, tmp_path):
+    """저장소 output/의 일일 사용량 장부 대신 빈 장부, 속도 제한 없음"""
+    monkeypatch.setattr(main, 'QUOTA_PATH', tmp_path / 'quota.json')
+    monkeypatch.setattr(main, 'PROVIDER_RATE_LIMITS', {name: 0 for name in main.PROVIDER_RATE_LIMITS})
+    monkeypatch.setattr(main, 'SCHEDULER', main.RequestScheduler())
+
+
+def keyword_tool(match, query):
+    """힌트 키워드와 같거나 힌트로 시작하는 녹화 행만 반환 (연관 키워드 포함)"""
+    hints = query['hintKeywords'][0].split(',')
+    rows = [row for row in KEYWORD_TOOL['keywordList']
+            if any(row['relKeyword'].startswith(hint) for hint in hints)]
+    return 200, {}, {'keywordList': rows}
+
+
+def best_categories(match, query):
+    return 200, {}, BEST_CATEGORIES
+
+
+def coupang_client(server, **kwargs):
+    return main.CoupangPartnersClient('access-key', 'secret-key', base_url=server.url, backoff_base=0, **kwargs)
+
+
+def test_searchad_signs_requests_and_batches_five_hints(server):
+    server.route(r'/keywordstool', keyword_tool)
+    client = main.NaverSearchAdClient('1234567', 'access-key', 'secret-key', base_url=server.url, max_retries=0)
+    keywords = ['에어 프라이어', '캠핑의자', '무선청소기', '로봇 청소기', '공기청정기', '전기포트',
+                '믹서기', '텐트', '침낭', '등산화', '녹화없는키워드', '캠핑 의자']
+
+    volumes = client.search_volumes(keywords, workers=2)
+
+    # 정규화 중복('캠핑 의자')은 한 번만 요청, 5개씩 3회
+    assert len(server.requests) == 3
+    for request in server.requests:
+        hints = parse_qs(request['query'])['hintKeywords'][0].split(',')
+        assert 1 <= len(hints) <= main.SEARCHAD_HINT_BATCH
+        assert all(' ' not in hint for hint in hints)
+
+        headers = request['headers']
+        message = f"{headers['X-Timestamp']}.GET./keywordstool".encode('utf-8')
+        expected = base64.b64encode(hmac.new(b'secret-key', message, hashlib.sha256).digest()).decode('ascii')
+        assert headers['X-Signature'] == expected
+        assert headers['X-API-KEY'] == 'access-key'
+        assert headers['X-Customer'] == '1234567'
+
+    # 응답 행은 공백이 있는 원래 표기로 돌아가고, 연관 키워드 행은 무시
+    assert set(volumes) == set(keywords)
+    assert volumes['에어 프라이어'] == 41200 + 187300
+    assert volumes['캠핑 의자'] == volumes['캠핑의자'] == 12900 + 71400
+    assert volumes['무선청소기'] == 5 + 1234  # '< 10'은 5로 계산
+    assert volumes['녹화없는키워드'] is None
+
+
+def test_searchad_related_rows_are_attributed_to_hints(server):
+    server.route(r'/keywordstool', keyword_tool)
+    client = main.NaverSearchAdClient('1234567', 'access-key', 'secret-key', base_url=server.url, max_retries=0)
+    related = {}
+
+    volumes = client.search_volumes(['에어 프라이어', '캠핑의자', '텐트'], related=related)
+
+    assert volumes['에어 프라이어'] == 41200 + 187300
+    # 여러 힌트를 묶은 응답은 힌트를 포함하는 연관 행만 해당 힌트에 배분
+    assert related == {'에어 프라이어': ['에어프라이어추천'], '캠핑의자': [], '텐트': []}
+    assert len(server.requests) == 1
+
+    # 힌트 1개 조회는 힌트 외 모든 행이 연관 키워드
+    assert client.related_keywords('에어프라이어') == ['에어프라이어추천']
+
+
+def test_analyze_keywords_takes_related_keywords_from_prefetch(server, monkeypatch):
+    server.route(r'/keywordstool', keyword_tool)
+    client = main.NaverSearchAdClient('1234567', 'access-key', 'secret-key', base_url=server.url, max_retries=0)
+    monkeypatch.setattr(main, 'get_naver_searchad_client', lambda: client)
+    monkeypatch.setitem(main.PROVIDERS, 'blog_count', (lambda keyword: 1000, None))
+
+    results = main.analyze_keywords([{'keyword': '에어프라이어', 'source': 'NAVER'},
+                                     {'keyword': '텐트', 'source': 'NAVER'}])
+
+    related = {item['keyword']: list(item['related_keywords']) for item in results}
+    assert related == {'에어프라이어': ['에어프라이어추천'], '텐트': []}
+    # 연관 키워드는 검색량 대량 조회 응답에서 가져오므로 추가 요청 없음
+    assert len(server.requests) == 1
+
+
+def test_prefetch_admits_each_keyword_by_its_own_priority(server, monkeypatch):
+    server.route(r'/keywordstool', keyword_tool)
+    client = main.NaverSearchAdClient('1234567', 'access-key', 'secret-key', base_url=server.url,
+                                      max_retries=0, daily_quota=10)
+    monkeypatch.setattr(main, 'get_naver_searchad_client', lambda: client)
+    monkeypatch.setitem(main.PROVIDERS, 'blog_count', (lambda keyword: 1000, None))
+    # 남은 한도 2회: 수집 키워드는 허용, 롱테일은 예비분(20%)에 걸림
+    for _ in range(8):
+        main.SCHEDULER.reserve('naver_searchad')
+
+    results = main.analyze_keywords([{'keyword': '에어프라이어', 'source': 'NAVER'},
+                                     {'keyword': '텐트', 'source': 'NAVER', 'priority': main.PRIORITY_TAIL}])
+
+    assert [item['keyword'] for item in results] == ['에어프라이어']
+    assert [item['keyword'] for item in main.SCHEDULER.deferred] == ['텐트']
+    hints = [parse_qs(request['query'])['hintKeywords'][0] for request in server.requests]
+    assert hints == ['에어프라이어']
+
+
+def test_coupang_signs_requests_with_cea_authorization(server):
+    server.route(r'/v2/providers/affiliate_open_api/apis/openapi/products/bestcategories/(\d+)', best_categories)
+    client = coupang_client(server)
+
+    products = client.best_products(1001, limit=3)
+
+    assert [product['rank'] for product in products] == [1, 2, 3]
+    request = server.requests[0]
+    fields = dict(part.split('=', 1) for part in
+                  request['headers']['Authorization'][len('CEA '):].split(', '))
+    assert fields['algorithm'] == 'HmacSHA256'
+    assert fields['access-key'] == 'access-key'
+    assert re.fullmatch(r'\d{6}T\d{6}Z', fields['signed-date'])
+    message = f"{fields['signed-date']}GET{request['path']}{request['query']}".encode('utf-8')
+    assert fields['signature'] == hmac.new(b'secret-key', message, hashlib.sha256).hexdigest()
+    assert request['query'] == 'limit=3'
+
+
+def test_retries_after_429_with_retry_after(server):
+    attempts = []
+
+    def throttled(match, query):
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            return 429, {'Retry-After': '1'}, {'rCode': '429', 'rMessage': 'Too Many Requests'}
+        return best_categories(match, query)
+
+    server.route(r'.*/bestcategories/(\d+)', throttled)
+    client = coupang_client(server, max_retries=2)
+
+    assert len(client.best_products(1001)) == 3
+    assert len(attempts) == 2
+    assert attempts[1] - attempts[0] >= 1.0
+    assert client.calls == 2
+
+
+def test_retry_after_is_capped_and_replaces_backoff(server, monkeypatch):
+    attempts = []
+
+    def throttled(match, query):
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            return 429, {'Retry-After': '3600'}, {'rCode': '429', 'rMessage': 'Too Many Requests'}
+        return best_categories(match, query)
+
+    monkeypatch.setattr(main, 'HTTP_MAX_RETRY_AFTER', 0.2)
+    server.route(r'.*/bestcategories/(\d+)', throttled)
+    client = main.CoupangPartnersClient('access-key', 'secret-key', base_url=server.url,
+                                        backoff_base=5, max_retries=1)
+
+    assert len(client.best_products(1001)) == 3
+    # 상한(0.2초)만 대기하고 지수 백오프(5초)는 더하지 않음
+    assert 0.2 <= attempts[1] - attempts[0] < 2
+
+
+def test_retries_wait_on_rate_limiter(server):
+    class CountingLimiter:
+        waits = 0
+
+        def wait(self):
+            self.waits += 1
+
+    statuses = iter([503, 503])
+    server.route(r'.*/bestcategories/(\d+)',
+                 lambda match, query: (next(statuses, 200), {}, BEST_CATEGORIES))
+    limiter = CountingLimiter()
+    client = coupang_client(server, max_retries=2, limiter=limiter)
+
+    assert len(client.best_products(1001)) == 3
+    assert len(server.requests) == 3
+    assert limiter.waits == 2
+
+
+def test_naver_openapi_sends_client_headers_and_parses_total(server):
+    server.route(r'/v1/search/blog\.json', lambda match, query: (200, {}, {
+        'total': 48213 if query['query'] == ['캠핑의자'] else 0, 'display': 1, 'items': []}))
+    client = main.NaverOpenApiClient('client-id', 'client-secret', base_url=server.url, max_retries=0)
+
+    assert client.blog_total('캠핑의자') == 48213
+    request = server.requests[0]
+    assert request['headers']['X-Naver-Client-Id'] == 'client-id'
+    assert request['headers']['X-Naver-Client-Secret'] == 'client-secret'
+    assert parse_qs(request['query']) == {'query': ['캠핑의자'], 'display': ['1']}
+    assert client.calls == 1
+
+
+def test_non_json_response_becomes_provider_error(server):
+    server.route(r'.*/bestcategories/(\d+)', lambda match, query: (200, {}, b'<html>gateway error</html>'))
+    client = coupang_client(server, max_retries=1)
+
+    with pytest.raises(main.ProviderError):
+        client.best_products(1001)
+    assert len(server.requests) == 2
+
+
+def test_failed_category_is_skipped(server, monkeypatch):
+    def by_category(match, query):
+        if match.group(1) == '1002':
+            return 500, {}, {'rCode': '500', 'rMessage': 'Internal Server Error'}
+        return best_categories(match, query)
+
+    server.route(r'.*/bestcategories/(\d+)', by_category)
+    client = coupang_client(server, max_retries=0)
+    monkeypatch.setattr(main, 'get_coupang_client', lambda: client)
+    stats = {}
+
+    keywords = list(main.iter_coupang_trending_keywords(['1001', '1002', '1003'], workers=2, stats=stats))
+
+    assert stats['categories'] == 2
+    assert stats['failed'] == 1
+    assert len(keywords) == 6
+    assert {item['keyword'] for item in keywords} == {
+        'LG 퓨리케어 공기청정기', '삼성전자 비스포크 제트', '쿠쿠 전기포트'}
+    assert all(item['source'] == 'COUPANG' for item in keywords)
+
+
+def test_quota_exceeded_stops_fan_out(server):
+    server.route(r'.*/bestcategories/(\d+)', best_categories)
+    client = coupang_client(server, daily_quota=2)
+    stats = {}
+
+    products = list(main.iter_coupang_best_products(client, [str(1001 + i) for i in range(6)],
+                                                    workers=1, stats=stats))
+
+    # 한도 2회 사용 후 남은 카테고리는 요청하지 않음
+    assert len(server.requests) == 2
+    assert len(products) == 6
+    assert stats == {'categories': 2, 'failed': 1}
@@ -0,0 +1,86 @@
+"""일괄 점수화(score_records/score_batch)가 단건 계산과 같은 결과를 내는지 검증"""
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import main  # noqa: E402
+
+
+def scalar_score(search_volume, blog_count):
+    """기존 단건 경로 (경쟁강도 round, 황금지수 round(..., 1), 등급)"""
+    efficiency = round(blog_count / search_volume, 2) if search_volume > 0 else 999.99
+    golden_score = round(main.calculate_golden_score(search_volume, blog_count), 1)
+    return efficiency, golden_score, main.get_grade(golden_score)
+
+
+def raw_record(i, search_volume, blog_count):
+    return {
+        'keyword': f'키워드{i}', 'source': 'TEST', 'sources': ['TEST'],
+        'search_volume': search_volume, 'blog_count': blog_count,
+        'related_keywords': [], 'estimated': (),
+    }
+
+
+def assert_same_as_scalar(pairs):
+    records = main.score_records([raw_record(i, v, b) for i, (v, b) in enumerate(pairs)])
+    assert len(records) == len(pairs)
+    for (v, b), record in zip(pairs, records):
+        efficiency, golden_score, grade = scalar_score(v, b)
+        assert record['efficiency'] == efficiency, (v, b)
+        assert type(record['efficiency']) is type(efficiency), (v, b)
+        assert record['golden_score'] == golden_score, (v, b)
+        # 블로그 0건은 100.0(실수), 나머지는 정수
+        assert type(record['golden_score']) is type(golden_score), (v, b)
+        assert record['grade'] == grade, (v, b)
+
+
+def test_random_inputs_match_scalar_path():
+    rng = random.Random(20260101)
+    pairs = []
+    for _ in range(50000):
+        scale = rng.choice((10, 1000, 100000, 1000000))
+        pairs.append((rng.randint(0, scale), rng.randint(0, scale)))
+    assert_same_as_scalar(pairs)
+
+
+def test_boundary_inputs_match_scalar_path():
+    volumes = (0, 1, 49999, 50000, 50001, 99999, 100000, 100001)
+    pairs = [(v, 0) for v in volumes] + [(0, b) for b in (0, 1, 5000)]
+    # 경쟁강도 구간 경계 (0.1, 0.5, 1.0, 3.0) 양쪽
+    for v in (50000, 100000, 100001):
+        for ratio in (0.1, 0.5, 1.0, 3.0):
+            b = int(v * ratio)
+            pairs += [(v, b - 1), (v, b), (v, b + 1)]
+    assert_same_as_scalar(pairs)
+
+
+def test_half_cent_efficiencies_round_like_scalar_path():
+    # b/v가 x.xx5가 되는 조합 (np.round와 round()가 갈릴 수 있는 값)
+    pairs = []
+    for v in (200, 1000, 2000, 40000, 200000):
+        step = v // 200
+        pairs += [(v, step * k) for k in range(1, 1201, 2)]
+    assert_same_as_scalar(pairs)
+
+
+def test_score_batch_matches_score_records():
+    rng = random.Random(7)
+    pairs = [(rng.randint(0, 500000), rng.randint(0, 100000)) for _ in range(5000)]
+    scored = main.score_batch([v for v, _ in pairs], [b for _, b in pairs])
+    for i, (v, b) in enumerate(pairs):
+        efficiency, golden_score, grade = scalar_score(v, b)
+        assert scored['efficiency'][i] == efficiency
+        assert scored['golden_score'][i] == golden_score
+        assert main.GRADE_LABELS[scored['grade_code'][i]] == grade
+        assert bool(scored['zero_blog'][i]) == (b == 0)
+
+
+def test_sort_orders_keep_ties_in_original_order_both_ways():
+    data = [{'golden_score': score, 'efficiency': 0, 'search_volume': 0, 'blog_count': 0}
+            for score in (50, 70, 50, 90, 70)]
+    orders = main.sort_orders(data, columns=('golden_score',))['golden_score']
+
+    assert orders['desc'] == [3, 1, 4, 0, 2]
+    assert orders['asc'] == [0, 2, 1, 4, 3]